@@ -0,0 +1,372 @@
+import random
+import time
+from abc import ABC, abstractmethod
+from typing import List, Dict, Tuple, Type, Optional
+from src.ga.fitness import (
+    play_ipd,
+    discounted_play_ipd,
+    get_outcome_counts,
+    cycle_outcome_counts,
+    replace_outcome_cache,
+    score_outcomes
+)
+from src.ga.sparse_genome import SparseGenome
+
+# Registered evaluation backends, by name
+BACKENDS: Dict[str, Type["EvaluationBackend"]] = {}
+
+# The backend name and timings chosen by `get_tuned_backend`, by settings
+_tuned_backends: Dict[Tuple, Tuple[str, Dict[str, float]]] = {}
+
+
+class EvaluationBackend(ABC):
+    """
+    Abstract base class representing an engine that plays and scores IPD matches.
+
+    Backends must produce exactly the scores of the reference backend, drawing the same random
+    numbers, so they can be swapped without changing the results of a seeded run.
+
+    Backends evaluate the fitness of `GeneticAlgorithm` populations. Post-processing, tournaments
+    and the tournament service do not use them: they need the outcome counts of each match, to
+    re-score them against several payoff matrices or credit both players, so they call
+    `get_outcome_counts` directly.
+    """
+    name = ""
+
+    def supports(
+        self,
+        memory_size: int,
+        rounds: int,
+        noise_rate: float,
+        continuation_probability: Optional[float] = None
+    ) -> bool:
+        """
+        Checks whether the backend can evaluate matches under the given settings.
+
+        Args:
+            memory_size: The number of past opponent moves each strategy considers.
+            rounds: The number of IPD rounds to play.
+            noise_rate: The probability of flipping a player's move.
+            continuation_probability: The probability of playing another round after each round,
+                or None to play a fixed number of rounds (default: None).
+
+        Returns:
+            True if the backend supports the settings, otherwise False.
+        """
+        return True
+
+    @abstractmethod
+    def play(
+        self,
+        player: List[int],
+        opponent: List[int],
+        memory_size: int,
+        rounds: int,
+        payoff_matrix: Dict[Tuple[int, int], Tuple[int, int]],
+        noise_rate: float,
+        continuation_probability: Optional[float] = None
+    ) -> Tuple[float, float]:
+        """
+        Plays a single match between two genomes.
+
+        Args:
+            player: A bit string representing the player strategy.
+            opponent: A bit string representing the opponent strategy.
+            memory_size: The number of past opponent moves each strategy considers.
+            rounds: The number of IPD rounds to play. Ignored if `continuation_probability` is set.
+            payoff_matrix: A dictionary representing a payoff matrix.
+            noise_rate: The probability of flipping a player's move.
+            continuation_probability: The probability of playing another round after each round,
+                or None to play a fixed number of rounds (default: None).
+
+        Returns:
+            A tuple (player_score, opponent_score) with the accumulated scores.
+        """
+        pass
+
+    def score(
+        self,
+        genomes: List[List[int]],
+        opponents: List[List[int]],
+        memory_size: int,
+        rounds: int,
+        payoff_matrix: Dict[Tuple[int, int], Tuple[int, int]],
+        noise_rate: float,
+        continuation_probability: Optional[float] = None
+    ) -> List[float]:
+        """
+        Scores genomes against a set of opponents, like `fitness`.
+
+        Args:
+            genomes: The bit string representations of the genomes to score.
+            opponents: The opponent bit string representations to evaluate against.
+            memory_size: The number of past opponent moves each strategy considers.
+            rounds: The number of IPD rounds to play. Ignored if `continuation_probability` is set.
+            payoff_matrix: A dictionary representing a payoff matrix.
+            noise_rate: The probability of flipping a player's move.
+            continuation_probability: The probability of playing another round after each round,
+                or None to play a fixed number of rounds (default: None).
+
+        Returns:
+            The accumulated score of each genome against all the opponents.
+        """
+        return [
+            sum(
+                self.play(
+                    genome,
+                    opponent,
+                    memory_size,
+                    rounds,
+                    payoff_matrix,
+                    noise_rate,
+                    continuation_probability
+                )[0]
+                for opponent in opponents
+            )
+            for genome in genomes
+        ]
+
+
+def register_backend(backend_class: Type[EvaluationBackend]) -> Type[EvaluationBackend]:
+    """
+    Registers an evaluation backend under its name, so it can be selected by name and considered
+    by `tune_backend`. Can be used as a class decorator.
+
+    Args:
+        backend_class: The evaluation backend class.
+
+    Returns:
+        The evaluation backend class.
+    """
+    BACKENDS[backend_class.name] = backend_class
+    return backend_class
+
+
+def get_backend(name: str) -> EvaluationBackend:
+    """
+    Creates a registered evaluation backend.
+
+    Args:
+        name: The name of the backend.
+
+    Returns:
+        The evaluation backend.
+
+    Raises:
+        ValueError: If no backend is registered under the name.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown evaluation backend: {name}")
+    return BACKENDS[name]()
+
+
+@register_backend
+class ReferenceBackend(EvaluationBackend):
+    """
+    Simulates every match round by round with `play_ipd`.
+    """
+    name = "reference"
+
+    def play(
+        self,
+        player: List[int],
+        opponent: List[int],
+        memory_size: int,
+        rounds: int,
+        payoff_matrix: Dict[Tuple[int, int], Tuple[int, int]],
+        noise_rate: float,
+        continuation_probability: Optional[float] = None
+    ) -> Tuple[float, float]:
+        if continuation_probability is not None:
+            return discounted_play_ipd(
+                player, opponent, memory_size, payoff_matrix, continuation_probability, noise_rate
+            )
+        return play_ipd(player, opponent, memory_size, rounds, payoff_matrix, noise_rate)
+
+
+@register_backend
+class OutcomeCacheBackend(EvaluationBackend):
+    """
+    Reuses the cached outcome counts of noise-free matches with `get_outcome_counts`.
+    """
+    name = "outcome_cache"
+
+    def play(
+        self,
+        player: List[int],
+        opponent: List[int],
+        memory_size: int,
+        rounds: int,
+        payoff_matrix: Dict[Tuple[int, int], Tuple[int, int]],
+        noise_rate: float,
+        continuation_probability: Optional[float] = None
+    ) -> Tuple[float, float]:
+        if continuation_probability is not None:
+            return discounted_play_ipd(
+                player, opponent, memory_size, payoff_matrix, continuation_probability, noise_rate
+            )
+        counts = get_outcome_counts(player, opponent, memory_size, rounds, noise_rate)
+        return score_outcomes(counts, payoff_matrix)
+
+
+@register_backend
+class CycleBackend(EvaluationBackend):
+    """
+    Counts the outcomes of noise-free matches from their cycle with `cycle_outcome_counts`.
+    """
+    name = "cycle"
+
+    def supports(
+        self,
+        memory_size: int,
+        rounds: int,
+        noise_rate: float,
+        continuation_probability: Optional[float] = None
+    ) -> bool:
+        return noise_rate == 0 and continuation_probability is None
+
+    def play(
+        self,
+        player: List[int],
+        opponent: List[int],
+        memory_size: int,
+        rounds: int,
+        payoff_matrix: Dict[Tuple[int, int], Tuple[int, int]],
+        noise_rate: float,
+        continuation_probability: Optional[float] = None
+    ) -> Tuple[float, float]:
+        counts = cycle_outcome_counts(player, opponent, memory_size, rounds)
+        return score_outcomes(counts, payoff_matrix)
+
+
+def tune_backend(
+    genomes: List[List[int]],
+    opponents: List[List[int]],
+    memory_size: int,
+    rounds: int,
+    payoff_matrix: Dict[Tuple[int, int], Tuple[int, int]],
+    noise_rate: float,
+    continuation_probability: Optional[float] = None,
+    sample_size: int = 8,
+    passes: int = 2,
+    seed: int = 0
+) -> Tuple[EvaluationBackend, Dict[str, float]]:
+    """
+    Picks the fastest registered backend that scores a sample exactly like the reference backend.
+
+    Each backend that supports the settings scores the first `sample_size` distinct genomes against
+    every opponent `passes` times, since consecutive generations share most of their genomes. With
+    co-evolution the opponents are the whole population, so the sample grows with the population
+    size. Every backend starts from the same seed, so noisy scores must match exactly too.
+    Every backend also starts from an empty cache of noise-free match outcomes, so the timings do
+    not depend on earlier evaluations in the process. The caller's random state and outcome cache
+    are restored afterwards.
+
+    Args:
+        genomes: The bit string representations of the genomes to sample from.
+        opponents: The opponent bit string representations to evaluate against.
+        memory_size: The number of past opponent moves each strategy considers.
+        rounds: The number of IPD rounds to play.
+        payoff_matrix: A dictionary representing a payoff matrix.
+        noise_rate: The probability of flipping a player's move.
+        continuation_probability: The probability of playing another round after each round, or
+            None to play a fixed number of rounds (default: None).
+        sample_size: The number of distinct genomes to score (default: 8).
+        passes: The number of times the sample is scored (default: 2).
+        seed: The seed each backend's sample is scored with (default: 0).
+
+    Returns:
+        A tuple (backend, timings) with the chosen backend and the seconds each supporting backend
+        took to score the sample.
+    """
+    sample = list(dict.fromkeys(
+        genome if isinstance(genome, SparseGenome) else tuple(genome) for genome in genomes
+    ))[:sample_size]
+    settings = (memory_size, rounds, payoff_matrix, noise_rate, continuation_probability)
+
+    caller_state = random.getstate()
+    caller_cache = replace_outcome_cache({})
+    timings = {}
+    exact_backends = []
+    reference_scores = None
+    try:
+        for name in [ReferenceBackend.name] + sorted(set(BACKENDS) - {ReferenceBackend.name}):
+            backend = get_backend(name)
+            if not backend.supports(memory_size, rounds, noise_rate, continuation_probability):
+                continue
+
+            random.seed(seed)
+            replace_outcome_cache({})
+            start = time.perf_counter()
+            scores = [
+                backend.score(sample, opponents, *settings) for _ in range(passes)
+            ]
+            timings[name] = time.perf_counter() - start
+
+            if reference_scores is None:
+                reference_scores = scores
+            if scores == reference_scores:
+                exact_backends.append(backend)
+    finally:
+        random.setstate(caller_state)
+        replace_outcome_cache(caller_cache)
+
+    return min(exact_backends, key=lambda backend: timings[backend.name]), timings
+
+
+def get_tuned_backend(
+    genomes: List[List[int]],
+    opponents: List[List[int]],
+    memory_size: int,
+    rounds: int,
+    payoff_matrix: Dict[Tuple[int, int], Tuple[int, int]],
+    noise_rate: float,
+    continuation_probability: Optional[float] = None
+) -> Tuple[EvaluationBackend, Dict[str, float]]:
+    """
+    Picks a backend with `tune_backend`, tuning only once per process for the same settings.
+
+    Backends with near-equal timings would otherwise be chosen in turn by runs with the same
+    settings, such as batched replicates or successive halving candidates. The settings are the
+    match settings, the population size, the number of opponents and whether the genomes are
+    sparse.
+
+    Args:
+        genomes: The bit string representations of the genomes to sample from, such as the
+            population.
+        opponents: The opponent bit string representations to evaluate against.
+        memory_size: The number of past opponent moves each strategy considers.
+        rounds: The number of IPD rounds to play.
+        payoff_matrix: A dictionary representing a payoff matrix.
+        noise_rate: The probability of flipping a player's move.
+        continuation_probability: The probability of playing another round after each round, or
+            None to play a fixed number of rounds (default: None).
+
+    Returns:
+        A tuple (backend, timings) with the chosen backend and the seconds each supporting backend
+        took to score the sample when the settings were first tuned.
+    """
+    key = (
+        memory_size,
+        rounds,
+        tuple(sorted(payoff_matrix.items())),
+        noise_rate,
+        continuation_probability,
+        len(genomes),
+        len(opponents),
+        any(isinstance(genome, SparseGenome) for genome in genomes)
+    )
+    if key not in _tuned_backends:
+        backend, timings = tune_backend(
+            genomes,
+            opponents,
+            memory_size,
+            rounds,
+            payoff_matrix,
+            noise_rate,
+            continuation_probability
+        )
+        _tuned_backends[key] = backend.name, timings
+
+    name, timings = _tuned_backends[key]
+    return get_backend(name), dict(timings)
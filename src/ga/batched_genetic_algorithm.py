@@ -0,0 +1,265 @@
+import os
+import json
+import random
+from multiprocessing.pool import Pool
+from typing import Callable, List, Tuple, Type, Dict, Optional
+from src.ga.strategies import Strategy
+from src.ga.genetic_algorithm import GeneticAlgorithm
+from src.utils.stats import mean_confidence_interval
+
+
+class BatchedGeneticAlgorithm:
+    """
+    Runs several independent replicates of the genetic algorithm in worker processes and
+    aggregates them.
+
+    Each replicate is a separate `GeneticAlgorithm` with its own random number stream, so
+    replicate r evolves exactly like a `GeneticAlgorithm` run seeded with `seed + r`, and
+    replicates stop early independently. The replicates are built in the calling process, sharing
+    a single evaluation backend tuned once for the batch, then evolved in parallel.
+    """
+    def __init__(
+        self,
+        replicates: int,
+        seed: int,
+        population_size: int,
+        crossover_rate: float,
+        crossover_func: Callable[[List[int], List[int]], Tuple[List[int], List[int]]],
+        mutation_rate: float,
+        mutation_func: Callable[[List[int], float], List[int]],
+        generations: int,
+        early_stop_threshold: int,
+        elitism_rate: float,
+        tournament_size: int,
+        opponents: List[Type[Strategy]],
+        memory_size: int,
+        rounds: int,
+        payoff_matrix: Dict[Tuple[int, int], Tuple[int, int]],
+        noise_rate: float,
+        co_evolution: bool,
+        sparse_genomes: bool = False,
+        diversity_threshold: Optional[float] = None,
+        continuation_probability: Optional[float] = None,
+        backend: Optional[str] = None,
+        record_allele_frequencies: bool = False,
+        processes: Optional[int] = None
+    ):
+        """
+        Initializes the replicate populations.
+
+        Args:
+            replicates: The number of independent replicate populations.
+            seed: The seed of the first replicate. Replicate r is seeded with `seed + r`.
+            population_size: The number of individuals in each population.
+            crossover_rate: The probability of performing crossover.
+            crossover_func: The function that performs crossover on two parents.
+            mutation_rate: The probability of performing mutation.
+            mutation_func: The function that performs mutation on an individual.
+            generations: The number of generations to run the algorithm for.
+            early_stop_threshold: The number of generations without improvement before stopping.
+            elitism_rate: The proportion of individuals to retain through elitism.
+            tournament_size: The size of the tournament for selection.
+            opponents: A list of opponent strategy classes.
+            memory_size: The number of past opponent moves each strategy considers.
+            rounds: The number of IPD rounds to play.
+            payoff_matrix: A dictionary representing a payoff matrix.
+            noise_rate: The probability of flipping a player's move.
+            co_evolution: If True, individuals compete against each other instead of fixed
+                opponents.
+            sparse_genomes: If True, individuals are lazily materialised `SparseGenome`s
+                (default: False).
+            diversity_threshold: The mean pairwise Hamming distance, as a proportion of the genome
+                length, at or below which a replicate stops early, or None to disable the rule
+                (default: None).
+            continuation_probability: The probability of playing another round after each round,
+                or None to play `rounds` rounds (default: None).
+            backend: The name of the registered evaluation backend that plays the matches, or None
+                to tune one with the first replicate's population and use it for every replicate
+                (default: None).
+            record_allele_frequencies: If True, each replicate records the frequency of the 1
+                allele at each locus every generation (default: False).
+            processes: The number of worker processes, or None to use the CPU count (default:
+                None).
+        """
+        self.replicates = replicates
+        self.seed = seed
+        self.generations = generations
+        self.processes = processes
+
+        caller_state = random.getstate()
+        self.replicate_gas = []
+        self.random_states = []
+        self.backend_timings = {}
+        for replicate in range(replicates):
+            random.seed(seed + replicate)
+            ga = GeneticAlgorithm(
+                population_size,
+                crossover_rate,
+                crossover_func,
+                mutation_rate,
+                mutation_func,
+                generations,
+                early_stop_threshold,
+                elitism_rate,
+                tournament_size,
+                opponents,
+                memory_size,
+                rounds,
+                payoff_matrix,
+                noise_rate,
+                co_evolution,
+                sparse_genomes=sparse_genomes,
+                diversity_threshold=diversity_threshold,
+                continuation_probability=continuation_probability,
+                backend=backend,
+                record_allele_frequencies=record_allele_frequencies
+            )
+            if backend is None:
+                # Tune once for the batch, so every replicate uses the same backend
+                backend, self.backend_timings = ga.backend.name, ga.backend_timings
+
+            self.replicate_gas.append(ga)
+            self.random_states.append(random.getstate())
+        random.setstate(caller_state)
+
+    @property
+    def populations(self) -> List[List[List[int]]]:
+        """
+        The current populations, indexed by replicate, individual and bit.
+        """
+        return [ga.population for ga in self.replicate_gas]
+
+    def evolve(self) -> None:
+        """
+        Runs the genetic algorithm on every replicate until it reaches the generation limit or
+        stops early.
+
+        The replicates are evolved in parallel worker processes, or in the calling process if
+        there is a single replicate or `processes` is 1.
+        """
+        tasks = list(zip(self.replicate_gas, self.random_states))
+        if self.replicates > 1 and self.processes != 1:
+            with Pool(min(self.processes or os.cpu_count() or 1, self.replicates)) as pool:
+                evolved = pool.map(_evolve_replicate, tasks)
+        else:
+            evolved = [_evolve_replicate(task) for task in tasks]
+
+        self.replicate_gas = [ga for ga, _ in evolved]
+        self.random_states = [random_state for _, random_state in evolved]
+
+    def get_results(self) -> Dict:
+        """
+        Collects the per-replicate results and their aggregates.
+
+        The results use the layout of `GeneticAlgorithm.get_results`, so they can be read by the
+        same loaders:
+        - "best_fitness" and "best_solutions" come from the replicates that reached the best
+            fitness, with the counts of their best solutions summed.
+        - "avg_fitness_per_gen" and "best_fitness_per_gen" hold the mean over the replicates
+            that reached each generation.
+        - "avg_fitness_band" and "best_fitness_band" hold the aggregates computed by
+            `aggregate_fitness_series`.
+        - "replicates" holds each replicate's results.
+
+        Returns:
+            A dictionary with the aggregated "results" and the shared "config".
+        """
+        replicate_results = [ga.get_results() for ga in self.replicate_gas]
+
+        config = replicate_results[0]["config"]
+        config["replicates"] = self.replicates
+        config["seed"] = self.seed
+        config["backend_timings"] = {
+            backend: round(seconds, 6) for backend, seconds in self.backend_timings.items()
+        }
+
+        best_fitness = max(ga.best_fitness for ga in self.replicate_gas)
+        best_solutions = {}
+        for ga, results in zip(self.replicate_gas, replicate_results):
+            if ga.best_fitness == best_fitness:
+                for solution, count in results["results"]["best_solutions"].items():
+                    best_solutions[solution] = best_solutions.get(solution, 0) + count
+
+        avg_fitness_band = aggregate_fitness_series(
+            [ga.avg_fitness_per_gen for ga in self.replicate_gas]
+        )
+        best_fitness_band = aggregate_fitness_series(
+            [ga.best_fitness_per_gen for ga in self.replicate_gas]
+        )
+
+        return {
+            "results": {
+                "best_fitness": best_fitness,
+                "best_solutions": best_solutions,
+                "avg_fitness_per_gen": avg_fitness_band["mean"],
+                "best_fitness_per_gen": best_fitness_band["mean"],
+                "avg_fitness_band": avg_fitness_band,
+                "best_fitness_band": best_fitness_band,
+                "replicates": [results["results"] for results in replicate_results]
+            },
+            "config": config
+        }
+
+    def save_results(self, path: str) -> None:
+        """
+        Saves the per-replicate results, their aggregates and the configuration to a JSON file.
+
+        Args:
+            path: The file path where the results will be saved.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as file:
+            json.dump(self.get_results(), file, indent=4)
+
+
+def _evolve_replicate(
+    task: Tuple[GeneticAlgorithm, object]
+) -> Tuple[GeneticAlgorithm, object]:
+    """
+    Evolves a single replicate from its own random state.
+
+    The caller's random state is restored afterwards, so evolving a replicate in-process does not
+    change the caller's random number stream.
+
+    Args:
+        task: A tuple (ga, random_state) with the replicate and its random state.
+
+    Returns:
+        A tuple (ga, random_state) with the evolved replicate and its final random state.
+    """
+    ga, random_state = task
+
+    caller_state = random.getstate()
+    random.setstate(random_state)
+    try:
+        ga.evolve()
+        random_state = random.getstate()
+    finally:
+        random.setstate(caller_state)
+
+    return ga, random_state
+
+
+def aggregate_fitness_series(series: List[List[float]]) -> Dict[str, List[float]]:
+    """
+    Aggregates fitness series of possibly different lengths into a mean and 95% confidence band.
+
+    Args:
+        series: A list of fitness series, one per replicate.
+
+    Returns:
+        A dictionary with the "mean", "ci_lower" and "ci_upper" series and the number of
+        replicates, "count", contributing to each generation.
+    """
+    aggregate = {"mean": [], "ci_lower": [], "ci_upper": [], "count": []}
+
+    for generation in range(max(len(values) for values in series)):
+        sample = [values[generation] for values in series if generation < len(values)]
+        sample_mean, half_width = mean_confidence_interval(sample)
+
+        aggregate["mean"].append(round(sample_mean, 4))
+        aggregate["ci_lower"].append(round(sample_mean - half_width, 4))
+        aggregate["ci_upper"].append(round(sample_mean + half_width, 4))
+        aggregate["count"].append(len(sample))
+
+    return aggregate
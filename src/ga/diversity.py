@@ -0,0 +1,87 @@
+from collections import Counter
+from typing import List, Dict
+from src.ga.history import pack_genome
+
+
+class DiversityTracker:
+    """
+    Tracks the diversity of a population incrementally from its packed genomes.
+
+    The tracker keeps per-locus allele counts and the multiplicity of each distinct packed genome.
+    When the population changes, only the genomes whose multiplicity changed update the allele
+    counts, so individuals carried over unchanged (such as elites and unmutated copies) cost
+    nothing beyond packing.
+    """
+    def __init__(self, genome_length: int):
+        """
+        Initializes an empty tracker.
+
+        Args:
+            genome_length: The number of bits in each individual.
+        """
+        self.genome_length = genome_length
+        self.population_size = 0
+        self.allele_counts = [0] * genome_length
+        self.genome_counts: Counter = Counter()
+        self.genomes: Dict[bytes, List[int]] = {}
+
+    def update(self, population: List[List[int]]) -> None:
+        """
+        Updates the tracked statistics to a new population.
+
+        Args:
+            population: The individuals of the new population.
+        """
+        new_counts = Counter()
+        for individual in population:
+            key = pack_genome(individual)
+            new_counts[key] += 1
+            if key not in self.genomes:
+                self.genomes[key] = list(individual)
+
+        for key in set(self.genome_counts) | set(new_counts):
+            delta = new_counts[key] - self.genome_counts[key]
+            if delta:
+                for locus, bit in enumerate(self.genomes[key]):
+                    if bit:
+                        self.allele_counts[locus] += delta
+
+        for key in set(self.genome_counts) - set(new_counts):
+            del self.genomes[key]
+
+        self.genome_counts = new_counts
+        self.population_size = len(population)
+
+    def allele_frequencies(self) -> List[float]:
+        """
+        Returns the frequency of the 1 allele at each locus.
+
+        Returns:
+            A list with the proportion of individuals with a 1 at each locus.
+        """
+        return [count / self.population_size for count in self.allele_counts]
+
+    def mean_pairwise_hamming_distance(self) -> float:
+        """
+        Computes the mean Hamming distance over all pairs of distinct individuals.
+
+        A locus with c ones among n individuals differs in c * (n - c) of the n * (n - 1) / 2
+        pairs, so the mean is computed from the allele counts in O(L) rather than O(n^2 * L).
+
+        Returns:
+            The mean pairwise Hamming distance.
+        """
+        n = self.population_size
+        if n < 2:
+            return 0.0
+
+        return sum(2 * count * (n - count) for count in self.allele_counts) / (n * (n - 1))
+
+    def unique_genomes(self) -> int:
+        """
+        Returns the number of distinct genomes in the population.
+
+        Returns:
+            The number of distinct genomes.
+        """
+        return len(self.genome_counts)
@@ -0,0 +1,125 @@
+import random
+from typing import List, Dict, Optional
+import numpy as np
+
+
+def replicator_dynamics(
+    score_matrix: List[List[float]],
+    initial_shares: List[float],
+    generations: int,
+    record_every: int = 1,
+    tolerance: float = 1e-12
+) -> Dict:
+    """
+    Iterates discrete replicator dynamics over the population shares of a set of strategies.
+
+    Each generation, a strategy's fitness is its expected score against the current population
+    mix, and its share grows in proportion to its fitness relative to the population average:
+    x_i' = x_i * f_i / f_avg, where f_i = sum_j A_ij * x_j.
+
+    Args:
+        score_matrix: A matrix where entry [i][j] is the score of strategy i against strategy j.
+        initial_shares: The initial population share of each strategy.
+        generations: The maximum number of generations to simulate.
+        record_every: The number of generations between recorded shares (default: 1).
+        tolerance: The maximum change in any share below which the shares are considered to have
+            reached a fixed point (default: 1e-12).
+
+    Returns:
+        A dictionary with the recorded "trajectory" of shares, the final "shares", the number of
+        "generations" simulated and whether the shares "converged" to a fixed point.
+
+    Raises:
+        ValueError: If the average fitness of the population is not positive.
+    """
+    scores = np.asarray(score_matrix, dtype=float)
+    shares = np.asarray(initial_shares, dtype=float)
+    shares = shares / shares.sum()
+    trajectory = [shares.tolist()]
+    converged = False
+
+    generation = 0
+    recorded = True
+    while generation < generations:
+        generation += 1
+
+        fitnesses = scores @ shares
+        avg_fitness = shares @ fitnesses
+        if avg_fitness <= 0:
+            raise ValueError("Replicator dynamics require a positive average fitness.")
+
+        next_shares = shares * fitnesses / avg_fitness
+        change = np.abs(next_shares - shares).max()
+        shares = next_shares
+        recorded = False
+
+        if change < tolerance:
+            converged = True
+            break
+
+        if generation % record_every == 0:
+            trajectory.append(shares.tolist())
+            recorded = True
+
+    if not recorded:
+        trajectory.append(shares.tolist())
+
+    return {
+        "trajectory": trajectory,
+        "shares": shares.tolist(),
+        "generations": generation,
+        "converged": converged
+    }
+
+
+def simulate_ecology(
+    score_matrix: List[List[float]],
+    generations: int,
+    num_starts: int = 1,
+    record_every: int = 1,
+    seed: Optional[int] = None,
+    survival_threshold: float = 1e-6
+) -> Dict:
+    """
+    Simulates an ecological tournament from several initial population mixes.
+
+    The first run starts from uniform shares and the remaining runs start from shares drawn
+    uniformly at random from the simplex. The final shares of the converged runs are collected as
+    the fixed points of the dynamics.
+
+    Args:
+        score_matrix: A matrix where entry [i][j] is the score of strategy i against strategy j.
+        generations: The maximum number of generations to simulate.
+        num_starts: The number of initial share vectors (default: 1).
+        record_every: The number of generations between recorded shares (default: 1).
+        seed: The seed for the random initial shares, or None for a random seed (default: None).
+        survival_threshold: The minimum final share of a surviving strategy (default: 1e-6).
+
+    Returns:
+        A dictionary with the "runs", each with its initial shares, trajectory and survivors, and
+        the distinct "fixed_points" reached by the converged runs.
+    """
+    rng = random.Random(seed)
+    num_strategies = len(score_matrix)
+
+    runs = []
+    fixed_points = []
+    for start in range(num_starts):
+        if start == 0:
+            initial_shares = [1.0] * num_strategies
+        else:
+            initial_shares = [rng.expovariate(1.0) for _ in range(num_strategies)]
+
+        run = replicator_dynamics(score_matrix, initial_shares, generations, record_every)
+        run["initial_shares"] = [share / sum(initial_shares) for share in initial_shares]
+        run["survivors"] = [
+            i for i, share in enumerate(run["shares"]) if share >= survival_threshold
+        ]
+        runs.append(run)
+
+        if run["converged"]:
+            fixed_point = [round(share, 6) for share in run["shares"]]
+            if fixed_point not in fixed_points:
+                fixed_points.append(fixed_point)
+
+    return {"runs": runs, "fixed_points": fixed_points}
@@ -1,5 +1,16 @@
+import math
 import random
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
+import numpy as np
+from src.ga.sparse_genome import SparseGenome
+
+# Outcomes (player_move, opponent_move) in the order used by outcome counts: CC, CD, DC, DD
+OUTCOMES = [(0, 0), (0, 1), (1, 0), (1, 1)]
+
+# The maximum number of match outcome counts, noise-free or discounted, kept in the cache
+OUTCOME_CACHE_SIZE = 100000
+
+_outcome_cache: Dict[Tuple, Tuple[int, int, int, int]] = {}
 
 
 def fitness(
@@ -8,8 +19,9 @@ def fitness(
     memory_size: int,
     rounds: int,
     payoff_matrix: Dict[Tuple[int, int], Tuple[int, int]],
-    noise_rate: float
-) -> int:
+    noise_rate: float,
+    continuation_probability: Optional[float] = None
+) -> float:
     """
     Evaluates a player's fitness based on performance against opponents.
 
@@ -17,19 +29,68 @@ def fitness(
         player: A bit string representing the player strategy to evaluate.
         opponents: The opponent bit string representations to evaluate against.
         memory_size: The number of past opponent moves each strategy considers.
-        rounds: The number of IPD rounds to play.
+        rounds: The number of IPD rounds to play. Ignored if `continuation_probability` is set.
         payoff_matrix: A dictionary representing a payoff matrix.
         noise_rate: The probability of flipping a player's move.
+        continuation_probability: The probability of playing another round after each round, or
+            None to play a fixed number of rounds. If set, each match is scored by its exact
+            expected payoff, computed by `discounted_play_ipd` (default: None).
 
     Returns:
         The accumulated score achieved by the player against all the opponents.
     """
+    if continuation_probability is not None:
+        return sum(
+            discounted_play_ipd(
+                player, opponent, memory_size, payoff_matrix, continuation_probability, noise_rate
+            )[0]
+            for opponent in opponents
+        )
+
     return sum(
-        play_ipd(player, opponent, memory_size, rounds, payoff_matrix, noise_rate)[0]
+        score_outcomes(
+            get_outcome_counts(player, opponent, memory_size, rounds, noise_rate),
+            payoff_matrix
+        )[0]
         for opponent in opponents
     )
 
 
+def fitness_for_payoff_matrices(
+    player: List[int],
+    opponents: List[List[int]],
+    memory_size: int,
+    rounds: int,
+    payoff_matrices: List[Dict[Tuple[int, int], Tuple[int, int]]],
+    noise_rate: float
+) -> List[int]:
+    """
+    Evaluates a player's fitness under several payoff matrices, playing each match only once.
+
+    The moves in a match do not depend on the payoff matrix, so the outcome counts of each match
+    are accumulated and then scored against every payoff matrix.
+
+    Args:
+        player: A bit string representing the player strategy to evaluate.
+        opponents: The opponent bit string representations to evaluate against.
+        memory_size: The number of past opponent moves each strategy considers.
+        rounds: The number of IPD rounds to play.
+        payoff_matrices: A list of dictionaries representing payoff matrices.
+        noise_rate: The probability of flipping a player's move.
+
+    Returns:
+        A list with the accumulated score achieved by the player for each payoff matrix.
+    """
+    total_counts = [0] * len(OUTCOMES)
+    for opponent in opponents:
+        counts = get_outcome_counts(player, opponent, memory_size, rounds, noise_rate)
+        total_counts = [total + count for total, count in zip(total_counts, counts)]
+
+    return [
+        score_outcomes(total_counts, payoff_matrix)[0] for payoff_matrix in payoff_matrices
+    ]
+
+
 def play_ipd(
     player: List[int],
     opponent: List[int],
@@ -55,8 +116,35 @@ def play_ipd(
     Returns:
         A tuple (player_score, opponent_score) with the accumulated scores.
     """
-    player_score = 0
-    opponent_score = 0
+    counts = play_ipd_outcomes(player, opponent, memory_size, rounds, noise_rate)
+    return score_outcomes(counts, payoff_matrix)
+
+
+def play_ipd_outcomes(
+    player: List[int],
+    opponent: List[int],
+    memory_size: int,
+    rounds: int,
+    noise_rate: float = 0.0
+) -> Tuple[int, int, int, int]:
+    """
+    Simulates an Iterated Prisoner's Dilemma match and counts how often each outcome occurred.
+
+    The moves in a match are independent of the payoff matrix, so the counts can be scored against
+    any payoff matrix afterwards with `score_outcomes`.
+
+    Args:
+        player: A bit string representing the player strategy.
+        opponent: A bit string representing the opponent strategy.
+        memory_size: The number of past opponent moves each strategy considers.
+        rounds: The number of rounds to play.
+        noise_rate: The probability of flipping each player's move (default: 0.0).
+
+    Returns:
+        A tuple (CC, CD, DC, DD) with the number of rounds ending in each outcome, from the
+        player's perspective.
+    """
+    counts = [0, 0, 0, 0]
     player_history = []
     opponent_history = []
 
@@ -68,21 +156,418 @@ def play_ipd(
         opponent_move = opponent[opponent_idx]
 
         # Apply noise
-        if random.random() < noise_rate:
-            player_move = 1 - player_move
-        if random.random() < noise_rate:
-            opponent_move = 1 - opponent_move
+        if noise_rate > 0:
+            if random.random() < noise_rate:
+                player_move = 1 - player_move
+            if random.random() < noise_rate:
+                opponent_move = 1 - opponent_move
 
-        score_player, score_opponent = payoff_matrix[(player_move, opponent_move)]
-        player_score += score_player
-        opponent_score += score_opponent
+        counts[2 * player_move + opponent_move] += 1
 
         player_history.append(player_move)
         opponent_history.append(opponent_move)
 
+    return tuple(counts)
+
+
+def cycle_outcome_counts(
+    player: List[int],
+    opponent: List[int],
+    memory_size: int,
+    rounds: int
+) -> Tuple[int, int, int, int]:
+    """
+    Counts the outcomes of a noise-free match without simulating every round.
+
+    The next moves depend only on the last `memory_size` moves of both players, so a noise-free
+    match enters a cycle of joint histories after a transient. Once a joint history repeats, the
+    remaining rounds are counted from the cycle. The counts equal those of `play_ipd_outcomes`.
+
+    Args:
+        player: A bit string representing the player strategy.
+        opponent: A bit string representing the opponent strategy.
+        memory_size: The number of past opponent moves each strategy considers.
+        rounds: The number of rounds to play.
+
+    Returns:
+        A tuple (CC, CD, DC, DD) with the number of rounds ending in each outcome, from the
+        player's perspective.
+    """
+    state = ((), ())
+    first_seen = {}
+    outcomes = []
+
+    # Play until all rounds are played or a joint history repeats
+    while len(outcomes) < rounds and state not in first_seen:
+        first_seen[state] = len(outcomes)
+        player_history, opponent_history = state
+
+        player_move = player[get_move_index(opponent_history, memory_size)]
+        opponent_move = opponent[get_move_index(player_history, memory_size)]
+        outcomes.append(2 * player_move + opponent_move)
+
+        state = (
+            _push_move(player_history, player_move, memory_size),
+            _push_move(opponent_history, opponent_move, memory_size)
+        )
+
+    counts = [0, 0, 0, 0]
+    if len(outcomes) == rounds:
+        for outcome in outcomes:
+            counts[outcome] += 1
+        return tuple(counts)
+
+    cycle_start = first_seen[state]
+    cycle = outcomes[cycle_start:]
+    repeats, remainder = divmod(rounds - cycle_start, len(cycle))
+    for outcome in outcomes[:cycle_start]:
+        counts[outcome] += 1
+    for outcome in cycle:
+        counts[outcome] += repeats
+    for outcome in cycle[:remainder]:
+        counts[outcome] += 1
+
+    return tuple(counts)
+
+
+def get_outcome_counts(
+    player: List[int],
+    opponent: List[int],
+    memory_size: int,
+    rounds: int,
+    noise_rate: float = 0.0
+) -> Tuple[int, int, int, int]:
+    """
+    Returns the outcome counts of a match, reusing previous results for noise-free matches.
+
+    Noise-free matches are deterministic and draw no random numbers, so their outcome counts are
+    cached by genome without affecting the random number stream. Noisy matches are always
+    simulated.
+
+    Args:
+        player: A bit string representing the player strategy.
+        opponent: A bit string representing the opponent strategy.
+        memory_size: The number of past opponent moves each strategy considers.
+        rounds: The number of rounds to play.
+        noise_rate: The probability of flipping each player's move (default: 0.0).
+
+    Returns:
+        A tuple (CC, CD, DC, DD) with the number of rounds ending in each outcome, from the
+        player's perspective.
+    """
+    if noise_rate > 0:
+        return play_ipd_outcomes(player, opponent, memory_size, rounds, noise_rate)
+
+    key = (_genome_key(player), _genome_key(opponent), memory_size, rounds)
+    counts = _outcome_cache.get(key)
+    if counts is None:
+        counts = play_ipd_outcomes(player, opponent, memory_size, rounds)
+        if len(_outcome_cache) >= OUTCOME_CACHE_SIZE:
+            _outcome_cache.clear()
+        _outcome_cache[key] = counts
+    return counts
+
+
+def clear_outcome_cache() -> None:
+    """
+    Clears the cache of noise-free and discounted match outcome counts.
+    """
+    _outcome_cache.clear()
+
+
+def replace_outcome_cache(
+    cache: Dict[Tuple, Tuple[int, int, int, int]]
+) -> Dict[Tuple, Tuple[int, int, int, int]]:
+    """
+    Replaces the cache of noise-free and discounted match outcome counts.
+
+    Args:
+        cache: The new cache, such as an empty dictionary.
+
+    Returns:
+        The previous cache, which can be restored by passing it back.
+    """
+    global _outcome_cache
+    previous = _outcome_cache
+    _outcome_cache = cache
+    return previous
+
+
+def _genome_key(genome: List[int]) -> Tuple:
+    """
+    Returns a hashable key for a genome. Sparse genomes are hashed without being materialised.
+
+    Args:
+        genome: A bit string representing a strategy.
+
+    Returns:
+        The hashable key.
+    """
+    return genome if isinstance(genome, SparseGenome) else tuple(genome)
+
+
+def score_outcomes(
+    counts: Tuple[int, int, int, int],
+    payoff_matrix: Dict[Tuple[int, int], Tuple[int, int]]
+) -> Tuple[int, int]:
+    """
+    Scores outcome counts against a payoff matrix.
+
+    Args:
+        counts: A tuple (CC, CD, DC, DD) of outcome counts from the player's perspective.
+        payoff_matrix: A dictionary representing a payoff matrix.
+
+    Returns:
+        A tuple (player_score, opponent_score) with the accumulated scores.
+    """
+    player_score = 0
+    opponent_score = 0
+    for count, outcome in zip(counts, OUTCOMES):
+        score_player, score_opponent = payoff_matrix[outcome]
+        player_score += count * score_player
+        opponent_score += count * score_opponent
+
     return player_score, opponent_score
 
 
+def swap_outcomes(counts: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+    """
+    Converts outcome counts from the player's perspective to the opponent's perspective.
+
+    Args:
+        counts: A tuple (CC, CD, DC, DD) of outcome counts from the player's perspective.
+
+    Returns:
+        A tuple (CC, CD, DC, DD) of outcome counts from the opponent's perspective.
+    """
+    cc, cd, dc, dd = counts
+    return cc, dc, cd, dd
+
+
+def discounted_play_ipd(
+    player: List[int],
+    opponent: List[int],
+    memory_size: int,
+    payoff_matrix: Dict[Tuple[int, int], Tuple[int, int]],
+    continuation_probability: float,
+    noise_rate: float = 0.0
+) -> Tuple[float, float]:
+    """
+    Computes the expected payoffs of an Iterated Prisoner's Dilemma match that continues after each
+    round with probability w, without sampling match lengths or rounds.
+
+    The expected payoff equals the discounted sum of round payoffs, sum(w^t * payoff_t), which is
+    the payoff matrix scored against the discounted outcome counts of `discounted_outcome_counts`.
+
+    Args:
+        player: A bit string representing the player strategy.
+        opponent: A bit string representing the opponent strategy.
+        memory_size: The number of past opponent moves each strategy considers.
+        payoff_matrix: A dictionary representing a payoff matrix.
+        continuation_probability: The probability w of playing another round after each round.
+        noise_rate: The probability of flipping each player's move (default: 0.0).
+
+    Returns:
+        A tuple (player_score, opponent_score) with the expected accumulated scores.
+
+    Raises:
+        ValueError: If the continuation probability is not in [0, 1).
+    """
+    counts = discounted_outcome_counts(
+        player, opponent, memory_size, continuation_probability, noise_rate
+    )
+    return score_outcomes(counts, payoff_matrix)
+
+
+def discounted_outcome_counts(
+    player: List[int],
+    opponent: List[int],
+    memory_size: int,
+    continuation_probability: float,
+    noise_rate: float = 0.0
+) -> Tuple[float, float, float, float]:
+    """
+    Computes the expected discounted number of rounds ending in each outcome of a match that
+    continues after each round with probability w, reusing previous results.
+
+    The next moves depend only on the last `memory_size` moves of both players, so the match is a
+    chain over these joint histories:
+    - Without noise, the chain is deterministic and enters a cycle after a transient, so the counts
+        are the transient's plus a geometric series over the cycle.
+    - With noise, the counts V of the joint histories solve V = r + w * P * V, where r holds the
+        outcome probabilities of a round and P the transition probabilities. Each history has only
+        four successors, so the system is solved by value iteration, which converges geometrically
+        in w.
+
+    The counts are deterministic and draw no random numbers, so they are cached by genome in the
+    outcome cache without affecting the random number stream.
+
+    Args:
+        player: A bit string representing the player strategy.
+        opponent: A bit string representing the opponent strategy.
+        memory_size: The number of past opponent moves each strategy considers.
+        continuation_probability: The probability w of playing another round after each round.
+        noise_rate: The probability of flipping each player's move (default: 0.0).
+
+    Returns:
+        A tuple (CC, CD, DC, DD) with the expected discounted number of rounds ending in each
+        outcome, from the player's perspective.
+
+    Raises:
+        ValueError: If the continuation probability is not in [0, 1).
+    """
+    if not 0 <= continuation_probability < 1:
+        raise ValueError("The continuation probability must be in [0, 1).")
+
+    key = (
+        _genome_key(player), _genome_key(opponent), memory_size, continuation_probability,
+        noise_rate
+    )
+    counts = _outcome_cache.get(key)
+    if counts is None:
+        if noise_rate > 0:
+            counts = _discounted_markov_chain(
+                player, opponent, memory_size, continuation_probability, noise_rate
+            )
+        else:
+            counts = _discounted_cycle(player, opponent, memory_size, continuation_probability)
+        if len(_outcome_cache) >= OUTCOME_CACHE_SIZE:
+            _outcome_cache.clear()
+        _outcome_cache[key] = counts
+    return counts
+
+
+def _discounted_cycle(
+    player: List[int],
+    opponent: List[int],
+    memory_size: int,
+    continuation_probability: float
+) -> Tuple[float, float, float, float]:
+    """
+    Computes the discounted outcome counts of a noise-free match from its transient and cycle.
+
+    Args:
+        player: A bit string representing the player strategy.
+        opponent: A bit string representing the opponent strategy.
+        memory_size: The number of past opponent moves each strategy considers.
+        continuation_probability: The probability w of playing another round after each round.
+
+    Returns:
+        A tuple (CC, CD, DC, DD) with the discounted number of rounds ending in each outcome.
+    """
+    w = continuation_probability
+    state = ((), ())
+    first_seen = {}
+    outcomes = []
+
+    # Play until a joint history repeats
+    while state not in first_seen:
+        first_seen[state] = len(outcomes)
+        player_history, opponent_history = state
+
+        player_move = player[get_move_index(opponent_history, memory_size)]
+        opponent_move = opponent[get_move_index(player_history, memory_size)]
+        outcomes.append(2 * player_move + opponent_move)
+
+        state = (
+            _push_move(player_history, player_move, memory_size),
+            _push_move(opponent_history, opponent_move, memory_size)
+        )
+
+    cycle_start = first_seen[state]
+    cycle_length = len(outcomes) - cycle_start
+    cycle_discount = 1 / (1 - w ** cycle_length)
+
+    counts = [0.0] * len(OUTCOMES)
+    for t, outcome in enumerate(outcomes):
+        counts[outcome] += w ** t * (cycle_discount if t >= cycle_start else 1)
+
+    return counts[0], counts[1], counts[2], counts[3]
+
+
+def _discounted_markov_chain(
+    player: List[int],
+    opponent: List[int],
+    memory_size: int,
+    continuation_probability: float,
+    noise_rate: float,
+    tolerance: float = 1e-12
+) -> Tuple[float, float, float, float]:
+    """
+    Computes the expected discounted outcome counts of a noisy match by value iteration over the
+    joint histories reachable from the start of the match.
+
+    Args:
+        player: A bit string representing the player strategy.
+        opponent: A bit string representing the opponent strategy.
+        memory_size: The number of past opponent moves each strategy considers.
+        continuation_probability: The probability w of playing another round after each round.
+        noise_rate: The probability of flipping each player's move.
+        tolerance: The maximum total error of the counts, relative to the expected number of rounds
+            (default: 1e-12).
+
+    Returns:
+        A tuple (CC, CD, DC, DD) with the expected discounted number of rounds ending in each
+        outcome.
+    """
+    w = continuation_probability
+
+    # Discover the reachable joint histories and their successors, one per outcome
+    states = [((), ())]
+    state_indices = {states[0]: 0}
+    successors = []
+    probabilities = []
+    for state in states:
+        player_history, opponent_history = state
+        intended_player_move = player[get_move_index(opponent_history, memory_size)]
+        intended_opponent_move = opponent[get_move_index(player_history, memory_size)]
+
+        state_successors = []
+        state_probabilities = []
+        for player_move, opponent_move in OUTCOMES:
+            next_state = (
+                _push_move(player_history, player_move, memory_size),
+                _push_move(opponent_history, opponent_move, memory_size)
+            )
+            if next_state not in state_indices:
+                state_indices[next_state] = len(states)
+                states.append(next_state)
+            state_successors.append(state_indices[next_state])
+            state_probabilities.append(
+                (noise_rate if player_move != intended_player_move else 1 - noise_rate)
+                * (noise_rate if opponent_move != intended_opponent_move else 1 - noise_rate)
+            )
+        successors.append(state_successors)
+        probabilities.append(state_probabilities)
+
+    successors = np.array(successors)
+    probabilities = np.array(probabilities)
+
+    # Iterate V = r + w * P * V, with a column of V per outcome. After k iterations from V = r,
+    # the counts miss only the rounds after round k, which sum to w^(k + 1) / (1 - w)
+    iterations = math.ceil(math.log(tolerance) / math.log(w)) if w > 0 else 0
+    values = probabilities
+    for _ in range(iterations):
+        values = probabilities + w * np.einsum("so,sok->sk", probabilities, values[successors])
+
+    return tuple(float(count) for count in values[0])
+
+
+def _push_move(history: Tuple[int, ...], move: int, memory_size: int) -> Tuple[int, ...]:
+    """
+    Appends a move to a history, keeping only the last `memory_size` moves.
+
+    Args:
+        history: The past moves.
+        move: The new move.
+        memory_size: The number of past moves to keep.
+
+    Returns:
+        The updated history.
+    """
+    return (history + (move,))[-memory_size:] if memory_size > 0 else ()
+
+
 def get_move_index(history: List[int], memory_size: int) -> int:
     """
     Computes the move index into the bit string representation based on the opponent's history.
@@ -1,11 +1,16 @@
-import copy
 import random
 import os
 import json
-from typing import Callable, List, Tuple, Type, Dict
+from collections import Counter
+from typing import Callable, List, Tuple, Type, Dict, Optional
 from src.ga.strategies import Strategy, RandomStrategy, get_bit_representations_for_strategies
-from src.ga.fitness import fitness
-from src.ga.selection import elitism, tournament_selection
+from src.ga.backends import get_backend, get_tuned_backend
+from src.ga.interning import GenomePool
+from src.ga.sparse_genome import SparseGenome
+from src.ga.history import PopulationRecorder, NO_PARENT
+from src.ga.diversity import DiversityTracker
+from src.ga.trace import MatchTrace, TraceWriter, trace_ipd
+from src.ga.selection import elitism_indices, tournament_selection_indices
 
 
 class GeneticAlgorithm:
@@ -28,7 +33,14 @@ class GeneticAlgorithm:
         rounds: int,
         payoff_matrix: Dict[Tuple[int, int], Tuple[int, int]],
         noise_rate: float,
-        co_evolution: bool
+        co_evolution: bool,
+        history_path: Optional[str] = None,
+        sparse_genomes: bool = False,
+        trace_path: Optional[str] = None,
+        diversity_threshold: Optional[float] = None,
+        continuation_probability: Optional[float] = None,
+        backend: Optional[str] = None,
+        record_allele_frequencies: bool = False
     ):
         """
         Initializes the genetic algorithm.
@@ -50,12 +62,57 @@ class GeneticAlgorithm:
             noise_rate: The probability of flipping a player's move.
             co_evolution: If True, individuals compete against each other instead of fixed
                 opponents.
+            history_path: The path of a memory-mapped file recording every generation's
+                population, fitness scores and parent indices, or None to disable recording
+                (default: None). Every genome is recorded in full, so history cannot be combined
+                with `sparse_genomes`.
+            sparse_genomes: If True, individuals are lazily materialised `SparseGenome`s, so
+                memory and initialisation cost scale with the entries visited. This makes large
+                memory sizes feasible. The best solutions are materialised in the results
+                (default: False).
+            trace_path: The path of a trace file recording the matches played by every elite
+                individual in every generation, or None to disable tracing (default: None).
+            diversity_threshold: The mean pairwise Hamming distance, as a proportion of the genome
+                length, at or below which the population is considered converged and evolution
+                stops early, or None to disable the rule (default: None). Diversity is not tracked
+                for sparse genomes, so the rule cannot be combined with `sparse_genomes`.
+            continuation_probability: The probability of playing another round after each round,
+                or None to play `rounds` rounds. If set, matches are scored by their exact expected
+                payoff (default: None).
+            backend: The name of the registered evaluation backend that plays the matches, or None
+                to pick the fastest exact backend for these settings with `get_tuned_backend`
+                (default: None).
+            record_allele_frequencies: If True, the frequency of the 1 allele at each locus is
+                recorded every generation. This takes one value per locus per generation, so it is
+                off by default (default: False).
+
+        Raises:
+            ValueError: If both `trace_path` and `continuation_probability` are set, since traces
+                record a fixed number of rounds, if `sparse_genomes` is set with
+                `diversity_threshold` or `history_path`, since neither diversity nor history is
+                tracked for sparse genomes, or if the backend is unknown.
         """
+        if trace_path and continuation_probability is not None:
+            raise ValueError("Match traces require a fixed number of rounds.")
+        if sparse_genomes and diversity_threshold is not None:
+            raise ValueError("The diversity threshold requires dense genomes.")
+        if sparse_genomes and history_path:
+            raise ValueError("Population history requires dense genomes.")
+
         self.population_size = population_size
-        self.population = [
-            get_bit_representations_for_strategies([RandomStrategy], memory_size)[0]
-            for _ in range(population_size)
-        ]
+        if sparse_genomes:
+            genome_length = 2 ** (memory_size + 1) - 1
+            self.population = [SparseGenome(genome_length) for _ in range(population_size)]
+        else:
+            self.population = [
+                get_bit_representations_for_strategies([RandomStrategy], memory_size)[0]
+                for _ in range(population_size)
+            ]
+        self.sparse_genomes = sparse_genomes
+
+        # Individuals are handles to shared, immutable genome records
+        self.genome_pool = GenomePool()
+        self.population = [self.genome_pool.intern(individual) for individual in self.population]
 
         self.crossover_rate = crossover_rate
         self.crossover_func = crossover_func
@@ -75,71 +132,206 @@ class GeneticAlgorithm:
         self.payoff_matrix = payoff_matrix
         self.noise_rate = noise_rate
         self.co_evolution = co_evolution
+        self.continuation_probability = continuation_probability
+
+        if backend is None:
+            self.backend, self.backend_timings = get_tuned_backend(
+                self.population,
+                self.population if co_evolution else self.opponents,
+                memory_size,
+                rounds,
+                payoff_matrix,
+                noise_rate,
+                continuation_probability
+            )
+        else:
+            self.backend, self.backend_timings = get_backend(backend), {}
 
         self.avg_fitness_per_gen = []
         self.best_fitness_per_gen = []
         self.best_fitness = float("-inf")
         self.best_solutions = []
         self.no_improvement_count = 0
+        self.stopped = False
+
+        self.diversity_threshold = diversity_threshold
+        self.diversity_tracker = (
+            None if sparse_genomes else DiversityTracker(len(self.population[0]))
+        )
+        self.mean_hamming_distance_per_gen = []
+        self.unique_genomes_per_gen = []
+        self.record_allele_frequencies = record_allele_frequencies
+        self.allele_frequencies_per_gen = []
+
+        # Indices of each individual's parents in the previous generation
+        self.parent_indices = [(NO_PARENT, NO_PARENT)] * population_size
+        self.history_recorder = (
+            PopulationRecorder(history_path, generations, population_size, len(self.population[0]))
+            if history_path else None
+        )
+
+        # Traces of the current generation's noisy matches, per elite individual, while tracing
+        self.trace_writer = TraceWriter(trace_path) if trace_path else None
+        self.generation_traces = {}
 
-    def evolve(self) -> None:
+    def evolve(self, generations: Optional[int] = None) -> None:
         """
         Runs the genetic algorithm to evolve strategies.
+
+        Calling this again continues from the current population, unless the algorithm has
+        stopped early. The history and trace files are closed once the algorithm stops early or
+        has run `self.generations` generations, and the history file also once it is full.
+
+        Args:
+            generations: The number of generations to run, or None to run `self.generations`
+                (default: None).
         """
-        for _ in range(self.generations):
-            # Compute fitness
-            fitness_scores = self._get_fitness_scores()
-            self.avg_fitness_per_gen.append(sum(fitness_scores) / len(fitness_scores))
-            gen_best_fitness = max(fitness_scores)
-            self.best_fitness_per_gen.append(gen_best_fitness)
-
-            if gen_best_fitness > self.best_fitness:
-                self.best_fitness = gen_best_fitness
-                self.best_solutions = [
-                    copy.deepcopy(self.population[i])
-                    for i in range(self.population_size) if fitness_scores[i] == gen_best_fitness
-                ]
-                self.no_improvement_count = 0
-            else:
-                self.no_improvement_count += 1
+        if self.stopped:
+            return
 
-            # Check for early stopping
-            if self.no_improvement_count >= self.early_stop_threshold:
+        for _ in range(self.generations if generations is None else generations):
+            if not self.step():
                 break
 
-            # Elitism
-            elite_individuals = elitism(self.population, fitness_scores, self.elitism_count)
+        if self.history_recorder:
+            self.history_recorder.flush()
+        if self.trace_writer:
+            self.trace_writer.flush()
 
-            # Selection
-            parents = tournament_selection(
-                self.population,
-                fitness_scores,
-                self.tournament_size,
-                len(self.population) - self.elitism_count
+        if self.stopped or len(self.avg_fitness_per_gen) >= self.generations:
+            self.close()
+
+    def close(self) -> None:
+        """
+        Flushes and closes the history and trace files, if any.
+
+        This is done automatically once the algorithm stops early or has run its full budget.
+        """
+        if self.history_recorder:
+            self.history_recorder.close()
+            self.history_recorder = None
+        if self.trace_writer:
+            self.trace_writer.close()
+            self.trace_writer = None
+
+    def step(self) -> bool:
+        """
+        Runs a single generation of the genetic algorithm.
+
+        Returns:
+            False if the early stopping threshold was reached, otherwise True.
+        """
+        # Compute fitness
+        fitness_scores = self._get_fitness_scores()
+        self.avg_fitness_per_gen.append(sum(fitness_scores) / len(fitness_scores))
+        gen_best_fitness = max(fitness_scores)
+        self.best_fitness_per_gen.append(gen_best_fitness)
+
+        if self.history_recorder:
+            self.history_recorder.record(self.population, fitness_scores, self.parent_indices)
+            if self.history_recorder.recorded == self.history_recorder.generations:
+                # The history file is full
+                self.history_recorder.close()
+                self.history_recorder = None
+
+        if self.diversity_tracker:
+            self.diversity_tracker.update(self.population)
+            self.mean_hamming_distance_per_gen.append(
+                self.diversity_tracker.mean_pairwise_hamming_distance()
             )
+            self.unique_genomes_per_gen.append(self.diversity_tracker.unique_genomes())
+            if self.record_allele_frequencies:
+                self.allele_frequencies_per_gen.append(
+                    self.diversity_tracker.allele_frequencies()
+                )
+
+        if self.trace_writer:
+            generation = len(self.avg_fitness_per_gen) - 1
+            for i in elitism_indices(fitness_scores, self.elitism_count):
+                # Noise-free matches are deterministic, so only the elites' matches are replayed
+                traces = self.generation_traces[i] if self.noise_rate > 0 else self._trace(i)
+                for opponent_id, trace in traces:
+                    self.trace_writer.write(trace, i, opponent_id, generation)
+            self.generation_traces = {}
+
+        if gen_best_fitness > self.best_fitness:
+            self.best_fitness = gen_best_fitness
+            self.best_solutions = [
+                self.population[i]
+                for i in range(self.population_size) if fitness_scores[i] == gen_best_fitness
+            ]
+            self.no_improvement_count = 0
+        else:
+            self.no_improvement_count += 1
+
+        # Check for early stopping
+        if self.no_improvement_count >= self.early_stop_threshold or self._has_converged():
+            self.stopped = True
+            return False
+
+        # Elitism
+        elite_indices = elitism_indices(fitness_scores, self.elitism_count)
+        elite_individuals = [self.population[i] for i in elite_indices]
+        next_parent_indices = [(i, NO_PARENT) for i in elite_indices]
+
+        # Selection
+        selected_indices = tournament_selection_indices(
+            fitness_scores,
+            self.tournament_size,
+            len(self.population) - self.elitism_count
+        )
+        # Operators receive mutable copies of the shared genome records
+        parents = [
+            self.population[i] if self.sparse_genomes else list(self.population[i])
+            for i in selected_indices
+        ]
+
+        # Crossover
+        next_population = []
+        for i in range(0, len(parents) - 1, 2):
+            parent1, parent2 = parents[i], parents[i+1]
+            idx1, idx2 = selected_indices[i], selected_indices[i+1]
+
+            if random.random() < self.crossover_rate:
+                child1, child2 = self.crossover_func(parent1, parent2)
+                next_parent_indices.extend([(idx1, idx2), (idx2, idx1)])
+            else:
+                child1, child2 = parent1, parent2
+                next_parent_indices.extend([(idx1, NO_PARENT), (idx2, NO_PARENT)])
+
+            next_population.extend([child1, child2])
 
-            # Crossover
-            next_population = []
-            for i in range(0, len(parents) - 1, 2):
-                parent1, parent2 = parents[i], parents[i+1]
+        # Handle odd-lengths
+        if len(parents) % 2 == 1:
+            next_population.append(parents[-1])
+            next_parent_indices.append((selected_indices[-1], NO_PARENT))
 
-                if random.random() < self.crossover_rate:
-                    child1, child2 = self.crossover_func(parent1, parent2)
-                else:
-                    child1, child2 = parent1, parent2
+        # Mutation
+        for i in range(len(next_population)):
+            next_population[i] = self.mutation_func(next_population[i], self.mutation_rate)
 
-                next_population.extend([child1, child2])
+        # Replacement
+        self.population = [
+            self.genome_pool.intern(individual)
+            for individual in elite_individuals + next_population
+        ]
+        self.genome_pool.retain(self.population)
+        self.parent_indices = next_parent_indices
 
-            # Handle odd-lengths
-            if len(parents) % 2 == 1:
-                next_population.append(parents[-1])
+        return True
 
-            # Mutation
-            for i in range(len(next_population)):
-                next_population[i] = self.mutation_func(next_population[i], self.mutation_rate)
+    def _has_converged(self) -> bool:
+        """
+        Checks whether the population's diversity has collapsed below the diversity threshold.
+
+        Returns:
+            True if the diversity early-stop rule is enabled and met, otherwise False.
+        """
+        if self.diversity_threshold is None or not self.mean_hamming_distance_per_gen:
+            return False
 
-            # Replacement
-            self.population = elite_individuals + next_population
+        genome_length = self.diversity_tracker.genome_length
+        return self.mean_hamming_distance_per_gen[-1] / genome_length <= self.diversity_threshold
 
     def _get_fitness_scores(self) -> List[float]:
         """
@@ -149,33 +341,145 @@ class GeneticAlgorithm:
         population (excluding itself). Otherwise, individuals are evaluated against a fixed set of
         opponents.
 
+        When the scores are deterministic, that is without noise or with exact expected payoffs,
+        each distinct genome is evaluated once and its score is shared by all its copies. With
+        co-evolution, each pair of distinct genomes then plays a single match, weighted by the
+        number of copies of each genome. Noisy matches are sampled separately for every
+        individual and opponent.
+
         Returns:
             A list representing the fitness score for each individual in the population.
         """
+        if self.noise_rate > 0 and self.continuation_probability is None:
+            if self.trace_writer:
+                return self._get_traced_fitness_scores()
+            if self.co_evolution:
+                return [
+                    self._score([individual], self.population[:i] + self.population[i + 1:])[0]
+                    for i, individual in enumerate(self.population)
+                ]
+            return self._score(self.population, self.opponents)
+
+        # Evaluate each distinct genome once
+        multiplicities = Counter(self.population)
+        unique_genomes = list(multiplicities)
+
         if self.co_evolution:
-            return [
-                fitness(
-                    self.population[i],
-                    self.population[:i] + self.population[i+1:],
-                    self.memory_size,
-                    self.rounds,
-                    self.payoff_matrix,
-                    self.noise_rate
-                )
-                for i in range(self.population_size)
-            ]
+            unique_scores = dict.fromkeys(unique_genomes, 0)
+            for i, genome in enumerate(unique_genomes):
+                # Copies of a genome play each other, but no individual plays itself
+                if multiplicities[genome] > 1:
+                    score, _ = self._play(genome, genome)
+                    unique_scores[genome] += (multiplicities[genome] - 1) * score
+
+                for opponent in unique_genomes[i + 1:]:
+                    score, opponent_score = self._play(genome, opponent)
+                    unique_scores[genome] += multiplicities[opponent] * score
+                    unique_scores[opponent] += multiplicities[genome] * opponent_score
+        else:
+            unique_scores = dict(zip(unique_genomes, self._score(unique_genomes, self.opponents)))
+
+        return [unique_scores[individual] for individual in self.population]
+
+    def _score(self, genomes: List[List[int]], opponents: List[List[int]]) -> List[float]:
+        """
+        Scores genomes against opponents with the algorithm's backend and match settings.
+
+        Args:
+            genomes: The bit string representations of the genomes to score.
+            opponents: The opponent bit string representations to evaluate against.
+
+        Returns:
+            The accumulated score of each genome against all the opponents.
+        """
+        return self.backend.score(
+            genomes,
+            opponents,
+            self.memory_size,
+            self.rounds,
+            self.payoff_matrix,
+            self.noise_rate,
+            self.continuation_probability
+        )
+
+    def _play(self, player: List[int], opponent: List[int]) -> Tuple[float, float]:
+        """
+        Plays a single match between two genomes with the algorithm's backend and match settings.
+
+        Args:
+            player: A bit string representing the player strategy.
+            opponent: A bit string representing the opponent strategy.
+
+        Returns:
+            A tuple (player_score, opponent_score) with the accumulated scores.
+        """
+        return self.backend.play(
+            player,
+            opponent,
+            self.memory_size,
+            self.rounds,
+            self.payoff_matrix,
+            self.noise_rate,
+            self.continuation_probability
+        )
+
+    def _get_traced_fitness_scores(self) -> List[float]:
+        """
+        Computes the fitness scores like `_get_fitness_scores`, keeping the traces of the elites.
+
+        This is used for noisy matches, which cannot be replayed exactly afterwards. Only the
+        traces of the individuals currently ranked among the elites are kept, in
+        `self.generation_traces`, so the traces of the others are dropped as soon as their scores
+        are known.
+
+        Returns:
+            A list representing the fitness score for each individual in the population.
+        """
+        fitness_scores = []
+        self.generation_traces = {}
+        for i in range(self.population_size):
+            traces = self._trace(i)
+            fitness_scores.append(
+                sum(trace.scores(self.payoff_matrix)[0] for _, trace in traces)
+            )
+
+            # Keep the elites, breaking ties in favour of earlier individuals like elitism
+            self.generation_traces[i] = traces
+            if len(self.generation_traces) > self.elitism_count:
+                worst = min(self.generation_traces, key=lambda j: (fitness_scores[j], -j))
+                del self.generation_traces[worst]
+
+        return fitness_scores
+
+    def _trace(self, i: int) -> List[Tuple[int, MatchTrace]]:
+        """
+        Plays and traces the matches that make up an individual's fitness.
+
+        Args:
+            i: The index of the individual in the population.
+
+        Returns:
+            A list of (opponent id, trace) tuples, where the opponent id is the opponent's index in
+            the population with co-evolution, or in the fixed opponents otherwise.
+        """
+        if self.co_evolution:
+            opponents = [(j, opponent) for j, opponent in enumerate(self.population) if j != i]
         else:
-            return [
-                fitness(
-                    individual,
-                    self.opponents,
+            opponents = list(enumerate(self.opponents))
+
+        return [
+            (
+                opponent_id,
+                trace_ipd(
+                    self.population[i],
+                    opponent,
                     self.memory_size,
                     self.rounds,
-                    self.payoff_matrix,
                     self.noise_rate
                 )
-                for individual in self.population
-            ]
+            )
+            for opponent_id, opponent in opponents
+        ]
 
     def save_results(self, path: str) -> None:
         """
@@ -184,17 +488,43 @@ class GeneticAlgorithm:
         Args:
             path: The file path where the results will be saved.
         """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as file:
+            json.dump(self.get_results(), file, indent=4)
+
+    def get_results(self) -> Dict:
+        """
+        Collects the results and configuration of the genetic algorithm.
+
+        Returns:
+            A dictionary with the "results" and "config" of the genetic algorithm.
+        """
+        # Sparse genomes are materialised, so every results file stores bit strings the same way
         top_strategies = {}
         for individual in self.best_solutions:
             key = tuple(individual)
             top_strategies[key] = top_strategies.get(key, 0) + 1
 
+        backend_timings = {
+            backend: round(seconds, 6) for backend, seconds in self.backend_timings.items()
+        }
+
         results = {
             "results": {
                 "best_fitness": self.best_fitness,
                 "best_solutions": {str(k): v for k, v in top_strategies.items()},
                 "avg_fitness_per_gen": [round(fitness, 4) for fitness in self.avg_fitness_per_gen],
-                "best_fitness_per_gen": [round(fitness, 4) for fitness in self.best_fitness_per_gen]
+                "best_fitness_per_gen": [
+                    round(fitness, 4) for fitness in self.best_fitness_per_gen
+                ],
+                "mean_hamming_distance_per_gen": [
+                    round(distance, 4) for distance in self.mean_hamming_distance_per_gen
+                ],
+                "unique_genomes_per_gen": self.unique_genomes_per_gen,
+                "allele_frequencies_per_gen": [
+                    [round(frequency, 4) for frequency in frequencies]
+                    for frequencies in self.allele_frequencies_per_gen
+                ]
             },
             "config": {
                 "population_size": self.population_size,
@@ -211,10 +541,14 @@ class GeneticAlgorithm:
                 "rounds": self.rounds,
                 "payoff_matrix": {str(k): str(v) for k, v in self.payoff_matrix.items()},
                 "noise_rate": self.noise_rate,
-                "co_evolution": self.co_evolution
+                "co_evolution": self.co_evolution,
+                "sparse_genomes": self.sparse_genomes,
+                "diversity_threshold": self.diversity_threshold,
+                "record_allele_frequencies": self.record_allele_frequencies,
+                "continuation_probability": self.continuation_probability,
+                "backend": self.backend.name,
+                "backend_timings": backend_timings
             }
         }
 
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, 'w') as file:
-            json.dump(results, file, indent=4)
+        return results
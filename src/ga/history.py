@@ -0,0 +1,258 @@
+import mmap
+import struct
+from typing import List, Optional, Tuple, Iterator
+
+# File header: magic, generation capacity, population size, genome length, recorded generations
+HEADER_FORMAT = "<8sIIII"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+MAGIC = b"IPDHIST1"
+
+# Fitness scores and parent indices are stored little-endian with fixed sizes
+FITNESS_SIZE = struct.calcsize("<d")
+PARENT_INDEX_SIZE = struct.calcsize("<i")
+
+# Parent index recorded for individuals without a (second) parent
+NO_PARENT = -1
+
+
+def pack_genome(genome: List[int]) -> bytes:
+    """
+    Packs a bit string into bytes, most significant bit first, padding the last byte with zeros.
+
+    Args:
+        genome: A bit string.
+
+    Returns:
+        The packed bit string.
+    """
+    num_bytes = (len(genome) + 7) // 8
+    padding = num_bytes * 8 - len(genome)
+    value = int("".join(map(str, genome)) or "0", 2) << padding
+    return value.to_bytes(num_bytes, "big")
+
+
+def unpack_genome(packed: bytes, genome_length: int) -> List[int]:
+    """
+    Unpacks a bit string packed by `pack_genome`.
+
+    Args:
+        packed: The packed bit string.
+        genome_length: The number of bits in the bit string.
+
+    Returns:
+        The unpacked bit string.
+    """
+    bits = bin(int.from_bytes(packed, "big"))[2:].zfill(len(packed) * 8)
+    return [int(bit) for bit in bits[:genome_length]]
+
+
+class PopulationRecorder:
+    """
+    Appends each generation's packed population, fitness scores and parent indices to a
+    preallocated, memory-mapped history file.
+    """
+    def __init__(self, path: str, generations: int, population_size: int, genome_length: int):
+        """
+        Creates the history file, preallocated for the given number of generations.
+
+        Args:
+            path: The path of the history file.
+            generations: The maximum number of generations to record.
+            population_size: The number of individuals in each generation.
+            genome_length: The number of bits in each individual.
+        """
+        self.generations = generations
+        self.population_size = population_size
+        self.genome_length = genome_length
+        self.genome_size = (genome_length + 7) // 8
+        self.record_size = _record_size(population_size, self.genome_size)
+        self.recorded = 0
+
+        self.file = open(path, "w+b")
+        self.file.truncate(HEADER_SIZE + generations * self.record_size)
+        self.mmap = mmap.mmap(self.file.fileno(), 0)
+        self._write_header()
+
+    def record(
+        self,
+        population: List[List[int]],
+        fitness_scores: List[float],
+        parents: Optional[List[Tuple[int, int]]] = None
+    ) -> None:
+        """
+        Appends a generation to the history file.
+
+        Args:
+            population: The individuals of the generation.
+            fitness_scores: The fitness score of each individual.
+            parents: The indices of each individual's parents in the previous generation, or None
+                if they are unknown (default: None).
+
+        Raises:
+            ValueError: If the history file is full.
+        """
+        if self.recorded >= self.generations:
+            raise ValueError("The history file is full.")
+
+        if parents is None:
+            parents = [(NO_PARENT, NO_PARENT)] * self.population_size
+
+        offset = HEADER_SIZE + self.recorded * self.record_size
+        genomes = b"".join(pack_genome(individual) for individual in population)
+        fitness = struct.pack(f"<{len(fitness_scores)}d", *fitness_scores)
+        parent_indices = struct.pack(
+            f"<{2 * len(parents)}i", *[idx for pair in parents for idx in pair]
+        )
+
+        record = genomes + fitness + parent_indices
+        self.mmap[offset:offset + len(record)] = record
+        self.recorded += 1
+        self._write_header()
+
+    def flush(self) -> None:
+        """
+        Flushes the recorded generations to disk.
+        """
+        self.mmap.flush()
+
+    def close(self) -> None:
+        """
+        Flushes and closes the history file.
+        """
+        if not self.mmap.closed:
+            self.mmap.flush()
+            self.mmap.close()
+            self.file.close()
+
+    def __enter__(self) -> "PopulationRecorder":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _write_header(self) -> None:
+        self.mmap[:HEADER_SIZE] = struct.pack(
+            HEADER_FORMAT,
+            MAGIC,
+            self.generations,
+            self.population_size,
+            self.genome_length,
+            self.recorded
+        )
+
+
+class PopulationHistory:
+    """
+    Lazily reads generations from a history file written by `PopulationRecorder`.
+
+    Only the pages of the requested generations are read from disk.
+    """
+    def __init__(self, path: str):
+        """
+        Opens a history file.
+
+        Args:
+            path: The path of the history file.
+
+        Raises:
+            ValueError: If the file is not a history file.
+        """
+        self.file = open(path, "rb")
+        self.mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.generations, self.population_size, self.genome_length, self.recorded = (
+            struct.unpack(HEADER_FORMAT, self.mmap[:HEADER_SIZE])
+        )
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a population history file.")
+
+        self.genome_size = (self.genome_length + 7) // 8
+        self.record_size = _record_size(self.population_size, self.genome_size)
+
+    def __len__(self) -> int:
+        return self.recorded
+
+    def read_generation(
+        self,
+        generation: int
+    ) -> Tuple[List[List[int]], List[float], List[Tuple[int, int]]]:
+        """
+        Reads a single generation.
+
+        Args:
+            generation: The index of the generation.
+
+        Returns:
+            A tuple containing the population, the fitness scores and the parent indices of each
+            individual.
+
+        Raises:
+            IndexError: If the generation was not recorded.
+        """
+        if not 0 <= generation < self.recorded:
+            raise IndexError(f"Generation {generation} was not recorded.")
+
+        offset = HEADER_SIZE + generation * self.record_size
+        genomes_end = offset + self.population_size * self.genome_size
+        fitness_end = genomes_end + self.population_size * FITNESS_SIZE
+
+        population = [
+            unpack_genome(self.mmap[i:i + self.genome_size], self.genome_length)
+            for i in range(offset, genomes_end, self.genome_size)
+        ]
+        fitness_scores = list(struct.unpack(
+            f"<{self.population_size}d", self.mmap[genomes_end:fitness_end]
+        ))
+        parent_indices = struct.unpack(
+            f"<{2 * self.population_size}i", self.mmap[fitness_end:offset + self.record_size]
+        )
+        parents = list(zip(parent_indices[::2], parent_indices[1::2]))
+
+        return population, fitness_scores, parents
+
+    def read_generations(
+        self,
+        start: int = 0,
+        stop: Optional[int] = None
+    ) -> Iterator[Tuple[List[List[int]], List[float], List[Tuple[int, int]]]]:
+        """
+        Lazily reads a range of generations.
+
+        Args:
+            start: The index of the first generation (default: 0).
+            stop: The index after the last generation, or None for all recorded generations
+                (default: None).
+
+        Returns:
+            An iterator of (population, fitness scores, parent indices) tuples.
+        """
+        stop = self.recorded if stop is None else min(stop, self.recorded)
+        for generation in range(start, stop):
+            yield self.read_generation(generation)
+
+    def close(self) -> None:
+        """
+        Closes the history file.
+        """
+        self.mmap.close()
+        self.file.close()
+
+    def __enter__(self) -> "PopulationHistory":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def _record_size(population_size: int, genome_size: int) -> int:
+    """
+    Computes the size of a generation's record.
+
+    Args:
+        population_size: The number of individuals in each generation.
+        genome_size: The number of bytes in each packed individual.
+
+    Returns:
+        The number of bytes in each generation's record.
+    """
+    return population_size * (genome_size + FITNESS_SIZE + 2 * PARENT_INDEX_SIZE)
@@ -0,0 +1,44 @@
+from typing import List, Dict, Union
+from src.ga.sparse_genome import SparseGenome
+
+Genome = Union[tuple, SparseGenome]
+
+
+class GenomePool:
+    """
+    Interns genomes as immutable, shared records.
+
+    Equal genomes are mapped to the same record, so a population holds handles to its distinct
+    genomes. Records are immutable, so they can be shared between individuals without copying and
+    used as keys for per-genome work such as fitness evaluation.
+    """
+    def __init__(self):
+        """
+        Initializes an empty pool.
+        """
+        self.records: Dict[Genome, Genome] = {}
+
+    def intern(self, genome: Union[List[int], Genome]) -> Genome:
+        """
+        Returns the shared record of a genome, adding it to the pool if needed.
+
+        Args:
+            genome: A bit string, as a list, tuple or `SparseGenome`.
+
+        Returns:
+            The shared immutable record: a tuple, or the `SparseGenome` itself.
+        """
+        record = genome if isinstance(genome, (tuple, SparseGenome)) else tuple(genome)
+        return self.records.setdefault(record, record)
+
+    def retain(self, population: List[Genome]) -> None:
+        """
+        Drops the records that are no longer used by a population.
+
+        Args:
+            population: The interned individuals of the population.
+        """
+        self.records = {record: record for record in population}
+
+    def __len__(self) -> int:
+        return len(self.records)
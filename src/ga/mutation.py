@@ -1,11 +1,14 @@
 import random
 from typing import List
+from src.ga.sparse_genome import SparseGenome
 
 
 def bit_flip_mutation(individual: List[int], mutation_rate: float) -> List[int]:
     """
     Applies bit flip mutation to an individual.
 
+    Sparse genomes are mutated by adding a lazily applied flip layer, without visiting any bit.
+
     Args:
         strategy: The individual to mutate.
         mutation_rate: Probability of mutating each bit.
@@ -13,4 +16,7 @@ def bit_flip_mutation(individual: List[int], mutation_rate: float) -> List[int]:
     Returns:
         The mutated individual.
     """
+    if isinstance(individual, SparseGenome):
+        return individual.mutate(mutation_rate)
+
     return [bit if random.random() > mutation_rate else 1 - bit for bit in individual]
@@ -19,13 +19,25 @@ def elitism(
     Returns:
         A list of the top `elitism_count` individuals.
     """
-    return [
-        copy.deepcopy(population[i]) for i in sorted(
-            range(len(fitness_scores)),
-            key=lambda j: fitness_scores[j],
-            reverse=True
-        )[:elitism_count]
-    ]
+    return [copy.deepcopy(population[i]) for i in elitism_indices(fitness_scores, elitism_count)]
+
+
+def elitism_indices(fitness_scores: List[int], elitism_count: int) -> List[int]:
+    """
+    Selects the indices of the top `elitism_count` individuals based on their fitness scores.
+
+    Args:
+        fitness_scores: A list of fitness scores associated with each individual in the population.
+        elitism_count: The number of individuals to select.
+
+    Returns:
+        A list of the indices of the top `elitism_count` individuals.
+    """
+    return sorted(
+        range(len(fitness_scores)),
+        key=lambda j: fitness_scores[j],
+        reverse=True
+    )[:elitism_count]
 
 
 def tournament_selection(
@@ -48,9 +60,31 @@ def tournament_selection(
     Returns:
         A list of individuals selected through tournament selection.
     """
+    return [
+        population[i]
+        for i in tournament_selection_indices(fitness_scores, tournament_size, num_rounds)
+    ]
+
+
+def tournament_selection_indices(
+    fitness_scores: List[int],
+    tournament_size: int,
+    num_rounds: int
+) -> List[int]:
+    """
+    Selects the indices of individuals using tournament selection.
+
+    Args:
+        fitness_scores: A list of fitness scores associated with each individual in the population.
+        tournament_size: The number of individuals randomly selected for each tournament.
+        num_rounds: The number of rounds of tournament selection to perform.
+
+    Returns:
+        A list of the indices of the individuals selected through tournament selection.
+    """
     selected = []
     for _ in range(num_rounds):
-        competitors = random.sample(list(zip(population, fitness_scores)), tournament_size)
-        winner = max(competitors, key=lambda competitor: competitor[1])
-        selected.append(winner[0])
+        competitors = random.sample(range(len(fitness_scores)), tournament_size)
+        winner = max(competitors, key=lambda competitor: fitness_scores[competitor])
+        selected.append(winner)
     return selected
@@ -0,0 +1,216 @@
+import random
+from bisect import bisect_right
+from typing import List, Dict, Tuple, Optional, Iterator, Union
+
+MASK_64 = (1 << 64) - 1
+HASH_RANGE = 1 << 64
+
+
+class SparseGenome:
+    """
+    A lazily materialised bit string representation of a strategy.
+
+    Entries are derived deterministically from a per-segment seed only when they are read, so
+    memory and initialisation cost scale with the entries actually visited rather than the
+    2^(m+1) - 1 entries of the full table. Crossovers are stored as segments taken from each
+    parent, and mutations as per-segment flip layers, each a seed and a rate from which the flip
+    of an entry is derived when it is read. Entries are kept once read, since matches revisit the
+    same few entries. Genomes are immutable, so they can be shared between individuals without
+    copying.
+    """
+    def __init__(
+        self,
+        length: int,
+        seed: Optional[int] = None,
+        segments: Optional[List[Tuple[int, int, int, Tuple[Tuple[int, float], ...]]]] = None
+    ):
+        """
+        Initializes the genome.
+
+        Args:
+            length: The number of entries in the genome.
+            seed: The seed the entries are generated from, or None for a random seed. Ignored if
+                `segments` is provided (default: None).
+            segments: A list of (start, seed, shift, flips) tuples, sorted by start and starting at
+                0. The entry at index i of a segment is generated from its seed and position
+                i + shift, then flipped by each (flip_seed, rate) layer in `flips` whose hash of
+                the same position is below its rate (default: None).
+        """
+        if segments is None:
+            segments = [(0, random.getrandbits(64) if seed is None else seed, 0, ())]
+
+        self.length = length
+        self.segments = segments
+        self._starts = [start for start, _, _, _ in segments]
+        self._entries: Dict[int, int] = {}
+        self._hash = None
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[int, "SparseGenome"]:
+        if isinstance(index, slice):
+            return self._slice(index)
+
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("SparseGenome index out of range")
+
+        bit = self._entries.get(index)
+        if bit is None:
+            bit = self._generated(index)
+            self._entries[index] = bit
+        return bit
+
+    def __iter__(self) -> Iterator[int]:
+        for index in range(self.length):
+            yield self[index]
+
+    def __add__(self, other: "SparseGenome") -> "SparseGenome":
+        if not isinstance(other, SparseGenome):
+            return NotImplemented
+
+        offset = self.length
+        segments = _merge_segments(self.segments + [
+            (start + offset, seed, shift - offset, flips)
+            for start, seed, shift, flips in other.segments
+        ])
+
+        return SparseGenome(self.length + other.length, segments=segments)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SparseGenome):
+            return NotImplemented
+        return self.length == other.length and self.segments == other.segments
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash((self.length, tuple(self.segments)))
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"SparseGenome(length={self.length}, segments={self.segments})"
+
+    def __copy__(self) -> "SparseGenome":
+        return self
+
+    def __deepcopy__(self, memo: dict) -> "SparseGenome":
+        return self
+
+    def mutate(self, mutation_rate: float) -> "SparseGenome":
+        """
+        Flips each entry with probability `mutation_rate`, without visiting any entry.
+
+        A flip layer with a fresh seed is added to every segment, and each entry's flip is derived
+        from the layer's seed and the entry's position when the entry is read. Mutating costs a
+        single random number regardless of the length, while reading an entry for the first time
+        costs one hash per flip layer of its segment.
+
+        Args:
+            mutation_rate: Probability of flipping each entry.
+
+        Returns:
+            The mutated genome.
+        """
+        if mutation_rate <= 0:
+            return self
+
+        flip = (random.getrandbits(64), mutation_rate)
+        segments = [
+            (start, seed, shift, flips + (flip,)) for start, seed, shift, flips in self.segments
+        ]
+
+        return SparseGenome(self.length, segments=segments)
+
+    def _generated(self, index: int) -> int:
+        """
+        Generates the entry at an index from the seed and flip layers of its segment.
+
+        Args:
+            index: The index of the entry.
+
+        Returns:
+            The generated entry.
+        """
+        _, seed, shift, flips = self.segments[bisect_right(self._starts, index) - 1]
+        position = index + shift
+
+        bit = _hash(seed, position) & 1
+        for flip_seed, rate in flips:
+            if _hash(flip_seed, position) < rate * HASH_RANGE:
+                bit = 1 - bit
+        return bit
+
+    def _slice(self, index: slice) -> "SparseGenome":
+        """
+        Returns a contiguous slice of the genome, sharing its segment seeds and flip layers.
+
+        Args:
+            index: The slice, with a step of 1.
+
+        Returns:
+            The sliced genome.
+
+        Raises:
+            ValueError: If the slice step is not 1.
+        """
+        start, stop, step = index.indices(self.length)
+        if step != 1:
+            raise ValueError("SparseGenome slices must have a step of 1")
+        stop = max(start, stop)
+
+        segments = []
+        for k, (segment_start, seed, shift, flips) in enumerate(self.segments):
+            segment_end = self.segments[k + 1][0] if k + 1 < len(self.segments) else self.length
+            if segment_end <= start or segment_start >= stop:
+                continue
+            segments.append((max(segment_start, start) - start, seed, shift + start, flips))
+
+        if not segments:
+            _, seed, shift, flips = self.segments[-1]
+            segments = [(0, seed, shift + start, flips)]
+
+        return SparseGenome(stop - start, segments=segments)
+
+
+def _merge_segments(
+    segments: List[Tuple[int, int, int, Tuple[Tuple[int, float], ...]]]
+) -> List[Tuple[int, int, int, Tuple[Tuple[int, float], ...]]]:
+    """
+    Merges adjacent segments that generate their entries from the same seed, shift and flip
+    layers.
+
+    Crossovers between relatives often join segments that continue each other, so merging them
+    keeps segment lists short and makes equal genomes compare equal.
+
+    Args:
+        segments: A list of (start, seed, shift, flips) tuples, sorted by start.
+
+    Returns:
+        The merged list of segments.
+    """
+    merged = segments[:1]
+    for start, seed, shift, flips in segments[1:]:
+        if (seed, shift, flips) != merged[-1][1:]:
+            merged.append((start, seed, shift, flips))
+
+    return merged
+
+
+def _hash(seed: int, position: int) -> int:
+    """
+    Derives a pseudo-random 64-bit integer from a seed and a position using the SplitMix64
+    finalizer.
+
+    Args:
+        seed: The seed.
+        position: The position.
+
+    Returns:
+        The integer, uniform in [0, 2^64).
+    """
+    z = (seed + (position + 1) * 0x9E3779B97F4A7C15) & MASK_64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return z ^ (z >> 31)
@@ -0,0 +1,213 @@
+import os
+import json
+import random
+from multiprocessing.pool import Pool
+from typing import List, Dict, Tuple, Optional
+from src.ga.fitness import get_outcome_counts, score_outcomes
+from src.utils.stats import mean_confidence_interval
+
+
+def load_evolved_strategies(results_dir: str, memory_size: int) -> Dict[str, List[int]]:
+    """
+    Loads every evolved strategy from a directory of GA results files.
+
+    The directory is searched recursively. Only results files with a matching `memory_size` are
+    loaded, since bit string lengths depend on the memory size.
+
+    Args:
+        results_dir: The directory containing the GA results JSON files.
+        memory_size: The number of past opponent moves each strategy considers.
+
+    Returns:
+        A dictionary mapping a strategy name to its bit string representation. Each strategy is
+        named after its results file, relative to `results_dir`, and its rank among the file's
+        best solutions.
+    """
+    evolved_strategies = {}
+
+    for root, _, filenames in sorted(os.walk(results_dir)):
+        for filename in sorted(filenames):
+            if not filename.endswith(".json"):
+                continue
+
+            path = os.path.join(root, filename)
+            with open(path, 'r') as file:
+                data = json.load(file)
+
+            if "results" not in data or data.get("config", {}).get("memory_size") != memory_size:
+                continue
+
+            best_solutions = data["results"]["best_solutions"]
+            name = os.path.splitext(os.path.relpath(path, results_dir))[0]
+
+            # Order the best solutions by count, most frequent first
+            for k, strategy_str in enumerate(
+                sorted(best_solutions, key=best_solutions.get, reverse=True)
+            ):
+                evolved_strategies[f"{name}#{k}"] = [
+                    int(bit) for bit in strategy_str.strip("()").split(", ")
+                ]
+
+    return evolved_strategies
+
+
+def deduplicate_strategies(
+    strategies: Dict[str, List[int]]
+) -> Tuple[List[str], List[List[int]], Dict[str, List[str]]]:
+    """
+    Removes strategies with identical bit string representations.
+
+    The first strategy with a given bit string representation is kept, and the names of its
+    duplicates are recorded as aliases.
+
+    Args:
+        strategies: A dictionary mapping a strategy name to its bit string representation.
+
+    Returns:
+        A tuple containing the unique strategy names, their bit string representations and a
+        dictionary mapping each unique strategy name to the names of its duplicates.
+    """
+    names = []
+    representations = []
+    aliases = {}
+    seen = {}
+
+    for name, representation in strategies.items():
+        key = tuple(representation)
+        if key in seen:
+            aliases[seen[key]].append(name)
+            continue
+
+        seen[key] = name
+        names.append(name)
+        representations.append(representation)
+        aliases[name] = []
+
+    return names, representations, aliases
+
+
+def run_tournament(
+    strategies: List[List[int]],
+    memory_size: int,
+    rounds: int,
+    payoff_matrix: Dict[Tuple[int, int], Tuple[int, int]],
+    noise_rate: float = 0.0,
+    replicates: int = 1,
+    processes: Optional[int] = None,
+    seed: Optional[int] = None,
+    self_play: bool = False,
+    pool: Optional[Pool] = None
+) -> Dict[str, List]:
+    """
+    Runs a round-robin tournament where each strategy plays every other strategy.
+
+    Each unordered pair of strategies plays a single match per replicate, and both players are
+    credited from the match's outcome counts. Noisy replicates are played in parallel worker
+    processes, each with its own random seed. Noise-free matches are deterministic, so a single
+    replicate is played for them.
+
+    Args:
+        strategies: The bit string representations of the strategies.
+        memory_size: The number of past opponent moves each strategy considers.
+        rounds: The number of IPD rounds to play.
+        payoff_matrix: A dictionary representing a payoff matrix.
+        noise_rate: The probability of flipping a player's move (default: 0.0).
+        replicates: The number of noisy replicates to play (default: 1).
+        processes: The number of worker processes, or None to use the CPU count (default: None).
+        seed: The seed the replicate seeds are derived from, or None for a random seed (default:
+            None).
+        self_play: If True, each strategy also plays against itself (default: False).
+        pool: A worker pool to reuse for the replicates, or None to create one (default: None).
+
+    Returns:
+        A dictionary with the "mean", "ci_lower" and "ci_upper" score matrices, where entry [i][j]
+        is the score of strategy i against strategy j and the diagonal holds the self-play score
+        (zero unless `self_play` is set), and the
+        "total_mean", "total_ci_lower" and "total_ci_upper" lists of each strategy's total score
+        against the other strategies. Self-play scores are left out of the totals.
+    """
+    if noise_rate == 0:
+        replicates = 1
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+
+    tasks = [
+        (strategies, memory_size, rounds, noise_rate, seed + replicate, self_play)
+        for replicate in range(replicates)
+    ]
+    if replicates > 1 and pool is not None:
+        replicate_counts = pool.map(_play_round_robin, tasks)
+    elif replicates > 1 and processes != 1:
+        with Pool(min(processes or os.cpu_count() or 1, replicates)) as pool:
+            replicate_counts = pool.map(_play_round_robin, tasks)
+    else:
+        replicate_counts = [_play_round_robin(task) for task in tasks]
+
+    # Score each replicate, crediting both players from the same matches
+    num_strategies = len(strategies)
+    replicate_scores = []
+    for counts in replicate_counts:
+        scores = [[0] * num_strategies for _ in range(num_strategies)]
+        for i in range(num_strategies):
+            if self_play:
+                scores[i][i] = score_outcomes(counts[i][i], payoff_matrix)[0]
+            for j in range(i + 1, num_strategies):
+                scores[i][j], scores[j][i] = score_outcomes(counts[i][j], payoff_matrix)
+        replicate_scores.append(scores)
+
+    results = {key: [] for key in (
+        "mean", "ci_lower", "ci_upper", "total_mean", "total_ci_lower", "total_ci_upper"
+    )}
+    for i in range(num_strategies):
+        for key in ("mean", "ci_lower", "ci_upper"):
+            results[key].append([0.0] * num_strategies)
+
+        for j in range(num_strategies):
+            sample_mean, half_width = mean_confidence_interval(
+                [scores[i][j] for scores in replicate_scores]
+            )
+            results["mean"][i][j] = sample_mean
+            results["ci_lower"][i][j] = sample_mean - half_width
+            results["ci_upper"][i][j] = sample_mean + half_width
+
+        sample_mean, half_width = mean_confidence_interval(
+            [sum(scores[i]) - scores[i][i] for scores in replicate_scores]
+        )
+        results["total_mean"].append(sample_mean)
+        results["total_ci_lower"].append(sample_mean - half_width)
+        results["total_ci_upper"].append(sample_mean + half_width)
+
+    return results
+
+
+def _play_round_robin(
+    task: Tuple[List[List[int]], int, int, float, int, bool]
+) -> List[List[Optional[Tuple[int, int, int, int]]]]:
+    """
+    Plays a single replicate of a round-robin tournament.
+
+    The replicate is played from its own seed, and the caller's random state is restored
+    afterwards, so playing it in-process does not reset the caller's random number stream.
+
+    Args:
+        task: A tuple (strategies, memory_size, rounds, noise_rate, seed, self_play).
+
+    Returns:
+        A matrix where entry [i][j], for i < j (or i <= j with self-play), holds the outcome counts
+        of strategy i against strategy j. All other entries are None.
+    """
+    strategies, memory_size, rounds, noise_rate, seed, self_play = task
+
+    caller_state = random.getstate()
+    random.seed(seed)
+    try:
+        counts = [[None] * len(strategies) for _ in strategies]
+        for i in range(len(strategies)):
+            for j in range(i if self_play else i + 1, len(strategies)):
+                counts[i][j] = get_outcome_counts(
+                    strategies[i], strategies[j], memory_size, rounds, noise_rate
+                )
+    finally:
+        random.setstate(caller_state)
+
+    return counts
@@ -0,0 +1,323 @@
+import os
+import random
+import struct
+from typing import List, Dict, Tuple
+from src.ga.fitness import get_move_index
+from src.ga.history import pack_genome, unpack_genome
+
+# Record header: magic, player id, opponent id, generation, rounds
+RECORD_HEADER_FORMAT = "<4siiiI"
+RECORD_HEADER_SIZE = struct.calcsize(RECORD_HEADER_FORMAT)
+MAGIC = b"TRC2"
+
+
+class MatchTrace:
+    """
+    The round-by-round record of an Iterated Prisoner's Dilemma match.
+
+    The moves and noise flips of both players are stored as packed bits. Running scores are not
+    stored, since they can be rebuilt from the moves and a payoff matrix.
+    """
+    def __init__(
+        self,
+        rounds: int,
+        player_moves: bytes,
+        opponent_moves: bytes,
+        player_flips: bytes,
+        opponent_flips: bytes
+    ):
+        """
+        Initializes the trace.
+
+        Args:
+            rounds: The number of rounds played.
+            player_moves: The player's packed moves after noise.
+            opponent_moves: The opponent's packed moves after noise.
+            player_flips: The packed bits set for each round where noise flipped the player's
+                move.
+            opponent_flips: The packed bits set for each round where noise flipped the opponent's
+                move.
+        """
+        self.rounds = rounds
+        self.packed = (player_moves, opponent_moves, player_flips, opponent_flips)
+
+    @property
+    def player_moves(self) -> List[int]:
+        """
+        The player's moves after noise.
+        """
+        return unpack_genome(self.packed[0], self.rounds)
+
+    @property
+    def opponent_moves(self) -> List[int]:
+        """
+        The opponent's moves after noise.
+        """
+        return unpack_genome(self.packed[1], self.rounds)
+
+    @property
+    def player_flips(self) -> List[int]:
+        """
+        1 for each round where noise flipped the player's move, otherwise 0.
+        """
+        return unpack_genome(self.packed[2], self.rounds)
+
+    @property
+    def opponent_flips(self) -> List[int]:
+        """
+        1 for each round where noise flipped the opponent's move, otherwise 0.
+        """
+        return unpack_genome(self.packed[3], self.rounds)
+
+    def running_scores(
+        self,
+        payoff_matrix: Dict[Tuple[int, int], Tuple[int, int]]
+    ) -> Tuple[List[int], List[int]]:
+        """
+        Rebuilds the running scores of both players after each round.
+
+        Args:
+            payoff_matrix: A dictionary representing a payoff matrix.
+
+        Returns:
+            A tuple (player_scores, opponent_scores) with each player's score after each round.
+        """
+        player_scores = []
+        opponent_scores = []
+        player_score = 0
+        opponent_score = 0
+        for outcome in zip(self.player_moves, self.opponent_moves):
+            score_player, score_opponent = payoff_matrix[outcome]
+            player_score += score_player
+            opponent_score += score_opponent
+            player_scores.append(player_score)
+            opponent_scores.append(opponent_score)
+
+        return player_scores, opponent_scores
+
+    def scores(self, payoff_matrix: Dict[Tuple[int, int], Tuple[int, int]]) -> Tuple[int, int]:
+        """
+        Computes the final scores of the match.
+
+        Args:
+            payoff_matrix: A dictionary representing a payoff matrix.
+
+        Returns:
+            A tuple (player_score, opponent_score) with the accumulated scores.
+        """
+        player_scores, opponent_scores = self.running_scores(payoff_matrix)
+        if not player_scores:
+            return 0, 0
+        return player_scores[-1], opponent_scores[-1]
+
+
+def trace_ipd(
+    player: List[int],
+    opponent: List[int],
+    memory_size: int,
+    rounds: int,
+    noise_rate: float = 0.0
+) -> MatchTrace:
+    """
+    Simulates an Iterated Prisoner's Dilemma match like `play_ipd`, recording every round.
+
+    The same random numbers are drawn as by `play_ipd`, so a traced match can replace an untraced
+    one without changing the random number stream.
+
+    Args:
+        player: A bit string representing the player strategy.
+        opponent: A bit string representing the opponent strategy.
+        memory_size: The number of past opponent moves each strategy considers.
+        rounds: The number of rounds to play.
+        noise_rate: The probability of flipping each player's move (default: 0.0).
+
+    Returns:
+        The trace of the match.
+    """
+    player_history = []
+    opponent_history = []
+    player_flips = []
+    opponent_flips = []
+
+    for _ in range(rounds):
+        player_move = player[get_move_index(opponent_history, memory_size)]
+        opponent_move = opponent[get_move_index(player_history, memory_size)]
+
+        # Apply noise
+        player_flip = 0
+        opponent_flip = 0
+        if noise_rate > 0:
+            if random.random() < noise_rate:
+                player_move = 1 - player_move
+                player_flip = 1
+            if random.random() < noise_rate:
+                opponent_move = 1 - opponent_move
+                opponent_flip = 1
+
+        player_history.append(player_move)
+        opponent_history.append(opponent_move)
+        player_flips.append(player_flip)
+        opponent_flips.append(opponent_flip)
+
+    return MatchTrace(
+        rounds,
+        pack_genome(player_history),
+        pack_genome(opponent_history),
+        pack_genome(player_flips),
+        pack_genome(opponent_flips)
+    )
+
+
+class TraceWriter:
+    """
+    Writes match traces to a single trace file.
+
+    Each record holds a header with the player id, opponent id and generation, followed by the
+    bit-packed moves and noise flips of both players. The records carry no run id, so the file is
+    truncated when opened and only ever holds the traces of a single run.
+    """
+    def __init__(self, path: str):
+        """
+        Opens a trace file for writing, creating it if needed and truncating it otherwise.
+
+        Args:
+            path: The path of the trace file.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, "wb")
+
+    def write(self, trace: MatchTrace, player_id: int, opponent_id: int, generation: int) -> None:
+        """
+        Appends a match trace.
+
+        Args:
+            trace: The trace of the match.
+            player_id: The id of the player, such as its index in the population.
+            opponent_id: The id of the opponent, such as its index among the opponents.
+            generation: The generation the match was played in.
+        """
+        self.file.write(
+            struct.pack(
+                RECORD_HEADER_FORMAT, MAGIC, player_id, opponent_id, generation, trace.rounds
+            )
+            + b"".join(trace.packed)
+        )
+
+    def flush(self) -> None:
+        """
+        Flushes the written traces to disk.
+        """
+        self.file.flush()
+
+    def close(self) -> None:
+        """
+        Closes the trace file.
+        """
+        self.file.close()
+
+    def __enter__(self) -> "TraceWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class TraceReader:
+    """
+    Reads match traces from a trace file, indexed by (player id, opponent id, generation).
+
+    The index is built by reading only the record headers, and traces are read on demand.
+    """
+    def __init__(self, path: str):
+        """
+        Opens a trace file and indexes its records.
+
+        Args:
+            path: The path of the trace file.
+
+        Raises:
+            ValueError: If the file contains a malformed record.
+        """
+        self.file = open(path, "rb")
+        self.index: Dict[Tuple[int, int, int], List[Tuple[int, int]]] = {}
+
+        offset = 0
+        size = os.fstat(self.file.fileno()).st_size
+        while offset < size:
+            self.file.seek(offset)
+            magic, player_id, opponent_id, generation, rounds = struct.unpack(
+                RECORD_HEADER_FORMAT, self.file.read(RECORD_HEADER_SIZE)
+            )
+            if magic != MAGIC:
+                raise ValueError(f"Malformed trace record at offset {offset} of {path}.")
+
+            self.index.setdefault((player_id, opponent_id, generation), []).append(
+                (offset + RECORD_HEADER_SIZE, rounds)
+            )
+            offset += RECORD_HEADER_SIZE + _record_body_size(rounds)
+
+    def __len__(self) -> int:
+        return sum(len(records) for records in self.index.values())
+
+    def keys(self) -> List[Tuple[int, int, int]]:
+        """
+        Returns the (player id, opponent id, generation) keys of the recorded traces.
+
+        Returns:
+            The keys, in the order they were first written.
+        """
+        return list(self.index)
+
+    def read(self, player_id: int, opponent_id: int, generation: int) -> List[MatchTrace]:
+        """
+        Reads the traces recorded for a player, opponent and generation.
+
+        Args:
+            player_id: The id of the player.
+            opponent_id: The id of the opponent.
+            generation: The generation the match was played in.
+
+        Returns:
+            The matching traces, in the order they were written.
+
+        Raises:
+            KeyError: If no trace was recorded for the key.
+        """
+        return [
+            self._read_record(offset, rounds)
+            for offset, rounds in self.index[(player_id, opponent_id, generation)]
+        ]
+
+    def close(self) -> None:
+        """
+        Closes the trace file.
+        """
+        self.file.close()
+
+    def __enter__(self) -> "TraceReader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _read_record(self, offset: int, rounds: int) -> MatchTrace:
+        self.file.seek(offset)
+        body = self.file.read(_record_body_size(rounds))
+
+        bits_size = (rounds + 7) // 8
+        return MatchTrace(rounds, *[body[i * bits_size:(i + 1) * bits_size] for i in range(4)])
+
+
+def _record_body_size(rounds: int) -> int:
+    """
+    Computes the size of a record body.
+
+    Args:
+        rounds: The number of rounds in the match.
+
+    Returns:
+        The number of bytes following the record header.
+    """
+    return 4 * ((rounds + 7) // 8)
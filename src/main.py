@@ -1,4 +1,5 @@
 import os
+import math
 from typing import List, Callable, Tuple, Type, Dict
 from src.ga.crossover import single_point_crossover
 from src.ga.mutation import bit_flip_mutation
@@ -12,6 +13,12 @@ from src.ga.strategies import (
 )
 from src.ga.genetic_algorithm import GeneticAlgorithm
 
+# The metrics successive halving can rank parameter combinations by
+HALVING_METRICS = {
+    "best_fitness": lambda ga: ga.best_fitness,
+    "avg_fitness": lambda ga: ga.avg_fitness_per_gen[-1]
+}
+
 
 def run_ga(
     curr_dir: str = "",
@@ -45,11 +52,21 @@ def run_ga(
         (1, 1): (1, 1)   # Both defect
     },
     noise_rates: List[float] = [0, 0.05, 0.1, 0.2],
-    co_evolutions: List[bool] = [False, True]
+    co_evolutions: List[bool] = [False, True],
+    successive_halving: bool = False,
+    min_generations: int = 50,
+    keep_fraction: float = 0.5,
+    halving_metric: str = "best_fitness"
 ) -> None:
     """
     Runs the genetic algorithm using various parameter combinations.
 
+    With successive halving, the parameter combinations sharing an opponent environment, noise
+    rate and co-evolution setting are first run for `min_generations`. Only the top
+    `keep_fraction` by `halving_metric` continue from their current populations, with the budget
+    growing by a factor of 1 / `keep_fraction` each round until it reaches `generations`. Discarded
+    combinations save their truncated results.
+
     Args:
         curr_dir: The base directory where the results are stored (default: "").
         population_sizes: A list of population sizes to test (default: [75]).
@@ -68,7 +85,27 @@ def run_ga(
         payoff_matrix: A dictionary representing a payoff matrix.
         noise_rates: A list of noise rates to test (default: [0, 0.05, 0.1, 0.2]).
         co_evolutions: A list of co-evolution scenarios to test (default: [False, True]).
+        successive_halving: If True, poor parameter combinations are discarded early using
+            successive halving (default: False).
+        min_generations: The number of generations every combination is run for before the first
+            halving (default: 50).
+        keep_fraction: The proportion of combinations kept at each halving (default: 0.5).
+        halving_metric: The metric used to rank combinations, either "best_fitness" or
+            "avg_fitness", taken per opponent (default: "best_fitness").
+
+    Raises:
+        ValueError: If successive halving is enabled and the halving metric is unknown,
+            `keep_fraction` is not in (0, 1) or `min_generations` is less than 1.
     """
+    if successive_halving:
+        if halving_metric not in HALVING_METRICS:
+            raise ValueError(f"Unknown halving metric: {halving_metric}")
+        if not 0 < keep_fraction < 1:
+            raise ValueError("The keep fraction must be in (0, 1).")
+        if min_generations < 1:
+            raise ValueError("The minimum number of generations must be at least 1.")
+
+    runs = []
     for i, opponents in enumerate(opponent_environments):
         for population_size in population_sizes:
             for crossover_rate in crossover_rates:
@@ -77,7 +114,7 @@ def run_ga(
                         for mutation_func in mutation_funcs:
                             for noise_rate in noise_rates:
                                 for co_evolution in co_evolutions:
-                                    ga = GeneticAlgorithm(
+                                    ga_args = (
                                         population_size,
                                         crossover_rate,
                                         crossover_func,
@@ -94,28 +131,146 @@ def run_ga(
                                         noise_rate,
                                         co_evolution
                                     )
-                                    ga.evolve()
-
-                                    if co_evolution:
-                                        results_path = os.path.join(
-                                            curr_dir,
-                                            f"data/results/co-evo/env_{i}/{memory_size}_mem_"
-                                            f"{population_size}_pop_{crossover_rate}_"
-                                            f"{crossover_func.__name__}_{mutation_rate}_"
-                                            f"{mutation_func.__name__}_{noise_rate}_noise_"
-                                            f"{co_evolution}_co-evolution.json"
-                                        )
-                                    else:
-                                        results_path = os.path.join(
-                                            curr_dir,
-                                            f"data/results/env_{i}/{memory_size}_mem_"
-                                            f"{population_size}_pop_{crossover_rate}_"
-                                            f"{crossover_func.__name__}_{mutation_rate}_"
-                                            f"{mutation_func.__name__}_{noise_rate}_noise_"
-                                            f"{co_evolution}_co-evolution.json"
-                                        )
-
-                                    ga.save_results(results_path)
+                                    results_path = _get_results_path(
+                                        curr_dir,
+                                        i,
+                                        memory_size,
+                                        population_size,
+                                        crossover_rate,
+                                        crossover_func,
+                                        mutation_rate,
+                                        mutation_func,
+                                        noise_rate,
+                                        co_evolution
+                                    )
+                                    runs.append(
+                                        ((i, noise_rate, co_evolution), ga_args, results_path)
+                                    )
+
+    if not successive_halving:
+        for _, ga_args, results_path in runs:
+            ga = GeneticAlgorithm(*ga_args)
+            ga.evolve()
+            ga.save_results(results_path)
+        return
+
+    # Group the combinations that can be compared with each other
+    groups = {}
+    for group_key, ga_args, results_path in runs:
+        groups.setdefault(group_key, []).append((ga_args, results_path))
+
+    for group in groups.values():
+        _successive_halving(
+            [(GeneticAlgorithm(*ga_args), results_path) for ga_args, results_path in group],
+            generations,
+            min_generations,
+            keep_fraction,
+            halving_metric
+        )
+
+
+def _successive_halving(
+    candidates: List[Tuple[GeneticAlgorithm, str]],
+    generations: int,
+    min_generations: int,
+    keep_fraction: float,
+    halving_metric: str
+) -> None:
+    """
+    Runs successive halving over genetic algorithms, saving each one's results once it is
+    discarded or reaches the full budget.
+
+    Candidates are ranked by their metric per opponent, since co-evolution fitness sums over
+    `population_size - 1` opponents and would otherwise favour larger populations.
+
+    Args:
+        candidates: A list of (genetic algorithm, results path) tuples.
+        generations: The full generation budget.
+        min_generations: The generation budget of the first round.
+        keep_fraction: The proportion of candidates kept after each round.
+        halving_metric: The metric used to rank candidates, either "best_fitness" or
+            "avg_fitness". The arguments are validated by `run_ga`.
+    """
+    budget = min(min_generations, generations)
+    while True:
+        for ga, _ in candidates:
+            ga.evolve(budget - len(ga.avg_fitness_per_gen))
+
+        if budget >= generations or len(candidates) == 1:
+            break
+
+        candidates = sorted(
+            candidates,
+            key=lambda candidate: (
+                HALVING_METRICS[halving_metric](candidate[0]) / _get_num_opponents(candidate[0])
+            ),
+            reverse=True
+        )
+        num_kept = max(1, math.ceil(len(candidates) * keep_fraction))
+        for ga, results_path in candidates[num_kept:]:
+            ga.save_results(results_path)
+
+        candidates = candidates[:num_kept]
+        budget = min(generations, math.ceil(budget / keep_fraction))
+
+    for ga, results_path in candidates:
+        ga.evolve(generations - len(ga.avg_fitness_per_gen))
+        ga.save_results(results_path)
+
+
+def _get_num_opponents(ga: GeneticAlgorithm) -> int:
+    """
+    Returns the number of opponents each individual's fitness is summed over.
+
+    Args:
+        ga: The genetic algorithm.
+
+    Returns:
+        The number of opponents, at least 1.
+    """
+    num_opponents = ga.population_size - 1 if ga.co_evolution else len(ga.opponents)
+    return max(num_opponents, 1)
+
+
+def _get_results_path(
+    curr_dir: str,
+    env_idx: int,
+    memory_size: int,
+    population_size: int,
+    crossover_rate: float,
+    crossover_func: Callable[[List[int], List[int]], Tuple[List[int], List[int]]],
+    mutation_rate: float,
+    mutation_func: Callable[[List[int], float], List[int]],
+    noise_rate: float,
+    co_evolution: bool
+) -> str:
+    """
+    Builds the path of the results file for a parameter combination.
+
+    Args:
+        curr_dir: The base directory where the results are stored.
+        env_idx: The index of the opponent environment.
+        memory_size: The number of past opponent moves each strategy considers.
+        population_size: The number of individuals in the population.
+        crossover_rate: The probability of performing crossover.
+        crossover_func: The function that performs crossover on two parents.
+        mutation_rate: The probability of performing mutation.
+        mutation_func: The function that performs mutation on an individual.
+        noise_rate: The probability of flipping a player's move.
+        co_evolution: If True, individuals compete against each other instead of fixed opponents.
+
+    Returns:
+        The path of the results file.
+    """
+    results_dir = "data/results/co-evo" if co_evolution else "data/results"
+    return os.path.join(
+        curr_dir,
+        f"{results_dir}/env_{env_idx}/{memory_size}_mem_"
+        f"{population_size}_pop_{crossover_rate}_"
+        f"{crossover_func.__name__}_{mutation_rate}_"
+        f"{mutation_func.__name__}_{noise_rate}_noise_"
+        f"{co_evolution}_co-evolution.json"
+    )
 
 
 if __name__ == "__main__":
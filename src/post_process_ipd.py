@@ -1,5 +1,6 @@
+import os
 import json
-from typing import List, Type, Dict, Tuple
+from typing import List, Type, Dict, Tuple, Optional
 from src.ga.strategies import (
     Strategy,
     AlwaysCooperate,
@@ -9,7 +10,9 @@ from src.ga.strategies import (
     GrimTrigger,
     get_bit_representations_for_strategies
 )
-from src.ga.fitness import play_ipd
+from src.ga.fitness import get_outcome_counts, score_outcomes
+from src.ga.ecology import simulate_ecology
+from src.ga.tournament import load_evolved_strategies, deduplicate_strategies, run_tournament
 
 
 def post_process_ipd(
@@ -41,6 +44,174 @@ def post_process_ipd(
         payoff_matrix: A dictionary representing a payoff matrix.
         noise_rate: The probability of flipping a player's move (default: 0.0).
     """
+    strategy_names, strategy_representations, matches = _play_strategies(
+        evolved_strategy_path, strategies, memory_size, rounds, noise_rate
+    )
+    ranked_results = _rank_strategies(
+        strategy_names, strategy_representations, matches, payoff_matrix
+    )
+
+    with open(results_path, 'w') as file:
+        json.dump(ranked_results, file, indent=4)
+
+
+def post_process_payoff_sweep(
+    results_path: str,
+    evolved_strategy_path: str,
+    payoff_matrices: List[Dict[Tuple[int, int], Tuple[int, int]]],
+    strategies: List[Type[Strategy]] = [
+        AlwaysCooperate, AlwaysDefect, TitForTat, TitForTwoTats, GrimTrigger
+    ],
+    memory_size: int = 2,
+    rounds: int = 50,
+    noise_rate: float = 0.0
+) -> None:
+    """
+    Ranks the strategies, including the evolved strategy, under several payoff matrices.
+
+    Every match is played once and its outcome counts are re-scored for each payoff matrix, so
+    sweeping the payoff matrix costs almost no extra simulation.
+
+    Args:
+        results_path: The path where the results will be saved.
+        evolved_strategy_path: The path to the GA results JSON file.
+        payoff_matrices: A list of dictionaries representing payoff matrices.
+        strategies: A list of strategy classes to play against each other.
+        memory_size: The number of past opponent moves each strategy considers (default: 2).
+        rounds: The number of IPD rounds to play (default: 50).
+        noise_rate: The probability of flipping a player's move (default: 0.0).
+    """
+    strategy_names, strategy_representations, matches = _play_strategies(
+        evolved_strategy_path, strategies, memory_size, rounds, noise_rate
+    )
+
+    sweep_results = [
+        {
+            "payoff_matrix": {str(k): str(v) for k, v in payoff_matrix.items()},
+            "rankings": _rank_strategies(
+                strategy_names, strategy_representations, matches, payoff_matrix
+            )
+        }
+        for payoff_matrix in payoff_matrices
+    ]
+
+    with open(results_path, 'w') as file:
+        json.dump(sweep_results, file, indent=4)
+
+
+def post_process_tournament(
+    results_path: str,
+    evolved_results_dir: str,
+    strategies: List[Type[Strategy]] = [
+        AlwaysCooperate, AlwaysDefect, TitForTat, TitForTwoTats, GrimTrigger
+    ],
+    memory_size: int = 2,
+    rounds: int = 50,
+    payoff_matrix: Dict[Tuple[int, int], Tuple[int, int]] = {
+        (0, 0): (3, 3),  # Both cooperate
+        (0, 1): (0, 5),  # Player cooperates, opponent defects
+        (1, 0): (5, 0),  # Player defects, opponent cooperates
+        (1, 1): (1, 1)   # Both defect
+    },
+    noise_rate: float = 0.0,
+    replicates: int = 30,
+    processes: Optional[int] = None,
+    seed: Optional[int] = None,
+    self_play: bool = False
+) -> None:
+    """
+    Runs a round-robin tournament between the provided strategies and every evolved strategy in a
+    directory of GA results.
+
+    Identical strategies are merged, each unordered pair plays once per replicate, and noisy
+    replicates are played in parallel. Scores are reported as means with 95% confidence intervals.
+
+    Args:
+        results_path: The path where the results will be saved.
+        evolved_results_dir: The directory containing the GA results JSON files.
+        strategies: A list of strategy classes to play against each other.
+        memory_size: The number of past opponent moves each strategy considers (default: 2).
+        rounds: The number of IPD rounds to play (default: 50).
+        payoff_matrix: A dictionary representing a payoff matrix.
+        noise_rate: The probability of flipping a player's move (default: 0.0).
+        replicates: The number of noisy replicates to play (default: 30).
+        processes: The number of worker processes, or None to use the CPU count (default: None).
+        seed: The seed the replicate seeds are derived from, or None for a random seed (default:
+            None).
+        self_play: If True, each strategy also plays against itself, as needed by
+            `post_process_ecology`. Self-play scores are listed under `vs_opponents` but left out
+            of the overall scores (default: False).
+    """
+    all_strategies = dict(zip(
+        [s.__name__ for s in strategies],
+        get_bit_representations_for_strategies(strategies, memory_size)
+    ))
+    all_strategies.update(load_evolved_strategies(evolved_results_dir, memory_size))
+    strategy_names, strategy_representations, aliases = deduplicate_strategies(all_strategies)
+
+    scores = run_tournament(
+        strategy_representations,
+        memory_size,
+        rounds,
+        payoff_matrix,
+        noise_rate,
+        replicates,
+        processes,
+        seed,
+        self_play
+    )
+
+    results = {}
+    for i, name in enumerate(strategy_names):
+        vs_opponents = {
+            opponent_name: {
+                "mean": round(scores["mean"][i][j], 4),
+                "ci": [round(scores["ci_lower"][i][j], 4), round(scores["ci_upper"][i][j], 4)]
+            }
+            for j, opponent_name in enumerate(strategy_names) if i != j or self_play
+        }
+
+        results[name] = {
+            "overall_score": round(scores["total_mean"][i], 4),
+            "overall_score_ci": [
+                round(scores["total_ci_lower"][i], 4), round(scores["total_ci_upper"][i], 4)
+            ],
+            "aliases": aliases[name],
+            "bit_representation": strategy_representations[i],
+            "vs_opponents": dict(
+                sorted(vs_opponents.items(), key=lambda x: x[1]["mean"], reverse=True)
+            )
+        }
+
+    ranked_results = dict(
+        sorted(results.items(), key=lambda x: x[1]["overall_score"], reverse=True)
+    )
+
+    with open(results_path, 'w') as file:
+        json.dump(ranked_results, file, indent=4)
+
+
+def _play_strategies(
+    evolved_strategy_path: str,
+    strategies: List[Type[Strategy]],
+    memory_size: int,
+    rounds: int,
+    noise_rate: float
+) -> Tuple[List[str], List[List[int]], List[Tuple[int, int, Tuple[int, int, int, int]]]]:
+    """
+    Plays every strategy, including the evolved strategy, against every other strategy.
+
+    Args:
+        evolved_strategy_path: The path to the GA results JSON file.
+        strategies: A list of strategy classes to play against each other.
+        memory_size: The number of past opponent moves each strategy considers.
+        rounds: The number of IPD rounds to play.
+        noise_rate: The probability of flipping a player's move.
+
+    Returns:
+        A tuple containing the strategy names, their bit string representations and the matches
+        played, in order, as (player index, opponent index, outcome counts) tuples.
+    """
     # Determine the evolved strategy
     with open(evolved_strategy_path, 'r') as file:
         data = json.load(file)
@@ -56,6 +227,36 @@ def post_process_ipd(
     strategy_representations.append(evolved_strategy)
 
     # Play IPD
+    matches = []
+    for i, player in enumerate(strategy_representations):
+        for j, opponent in enumerate(strategy_representations):
+            if i == j:
+                continue
+
+            counts = get_outcome_counts(player, opponent, memory_size, rounds, noise_rate)
+            matches.append((i, j, counts))
+
+    return strategy_names, strategy_representations, matches
+
+
+def _rank_strategies(
+    strategy_names: List[str],
+    strategy_representations: List[List[int]],
+    matches: List[Tuple[int, int, Tuple[int, int, int, int]]],
+    payoff_matrix: Dict[Tuple[int, int], Tuple[int, int]]
+) -> Dict[str, Dict]:
+    """
+    Scores the played matches against a payoff matrix and ranks the strategies.
+
+    Args:
+        strategy_names: The names of the strategies.
+        strategy_representations: The bit string representations of the strategies.
+        matches: The matches played, as (player index, opponent index, outcome counts) tuples.
+        payoff_matrix: A dictionary representing a payoff matrix.
+
+    Returns:
+        A dictionary of strategy results, ranked by overall score.
+    """
     results = {
         name: {
             "overall_score": 0,
@@ -64,23 +265,16 @@ def post_process_ipd(
         } for i, name in enumerate(strategy_names)
     }
 
-    for i, (player, player_name) in enumerate(zip(strategy_representations, strategy_names)):
-        for j, (opponent, opponent_name) in enumerate(zip(
-            strategy_representations,
-            strategy_names
-        )):
-            if i == j:
-                continue
+    for i, j, counts in matches:
+        player_name = strategy_names[i]
+        opponent_name = strategy_names[j]
+        player_score, opponent_score = score_outcomes(counts, payoff_matrix)
 
-            player_score, opponent_score = play_ipd(
-                player, opponent, memory_size, rounds, payoff_matrix, noise_rate
-            )
-
-            results[player_name]["overall_score"] += player_score
-            results[opponent_name]["overall_score"] += opponent_score
+        results[player_name]["overall_score"] += player_score
+        results[opponent_name]["overall_score"] += opponent_score
 
-            results[player_name]["vs_opponents"][opponent_name] = player_score
-            results[opponent_name]["vs_opponents"][player_name] = opponent_score
+        results[player_name]["vs_opponents"][opponent_name] = player_score
+        results[opponent_name]["vs_opponents"][player_name] = opponent_score
 
     # Sort results
     for strategy in results:
@@ -89,9 +283,59 @@ def post_process_ipd(
         )
         results[strategy]["vs_opponents"]["total"] = sum(results[strategy]["vs_opponents"].values())
 
-    ranked_results = dict(
+    return dict(
         sorted(results.items(), key=lambda x: x[1]["overall_score"], reverse=True)
     )
 
+
+def post_process_ecology(
+    tournament_results_path: str,
+    generations: int = 5000,
+    num_starts: int = 1,
+    record_every: int = 10,
+    seed: Optional[int] = None
+) -> None:
+    """
+    Simulates an ecological tournament from the score matrix of a `post_process_tournament` run.
+
+    The strategy shares evolve under discrete replicator dynamics using the recorded mean scores,
+    so no matches are replayed. The share trajectories and fixed points are saved next to the
+    tournament results, with an "_ecology" suffix.
+
+    Args:
+        tournament_results_path: The path to the `post_process_tournament` results JSON file. The
+            tournament must have been run with `self_play` enabled.
+        generations: The maximum number of generations to simulate (default: 5000).
+        num_starts: The number of initial share vectors, the first being uniform and the rest
+            random (default: 1).
+        record_every: The number of generations between recorded shares (default: 10).
+        seed: The seed for the random initial shares, or None for a random seed (default: None).
+
+    Raises:
+        ValueError: If the tournament results have no self-play scores.
+    """
+    with open(tournament_results_path, 'r') as file:
+        tournament_results = json.load(file)
+
+    strategy_names = list(tournament_results)
+    for name in strategy_names:
+        if name not in tournament_results[name]["vs_opponents"]:
+            raise ValueError(
+                f"The tournament results have no self-play score for {name}. Run "
+                "post_process_tournament with self_play=True."
+            )
+
+    score_matrix = [
+        [
+            tournament_results[player]["vs_opponents"][opponent]["mean"]
+            for opponent in strategy_names
+        ]
+        for player in strategy_names
+    ]
+
+    ecology = simulate_ecology(score_matrix, generations, num_starts, record_every, seed)
+    ecology["strategies"] = strategy_names
+
+    results_path = os.path.splitext(tournament_results_path)[0] + "_ecology.json"
     with open(results_path, 'w') as file:
-        json.dump(ranked_results, file, indent=4)
+        json.dump(ecology, file, indent=4)
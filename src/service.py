@@ -0,0 +1,360 @@
+import os
+import json
+import socket
+import argparse
+import socketserver
+import threading
+from multiprocessing.pool import Pool
+from typing import List, Dict, Tuple, Optional, Union
+from src.ga.strategies import Strategy, get_bit_representations_for_strategies
+from src.ga.fitness import fitness, get_outcome_counts
+from src.ga.tournament import run_tournament
+
+DEFAULT_PAYOFF_MATRIX = {
+    (0, 0): (3, 3),  # Both cooperate
+    (0, 1): (0, 5),  # Player cooperates, opponent defects
+    (1, 0): (5, 0),  # Player defects, opponent cooperates
+    (1, 1): (1, 1)   # Both defect
+}
+
+# Outcome names used to encode payoff matrices in requests
+OUTCOME_NAMES = {"CC": (0, 0), "CD": (0, 1), "DC": (1, 0), "DD": (1, 1)}
+
+
+class TournamentService:
+    """
+    A long-lived evaluation service that keeps opponent tables, match caches and a worker pool
+    warm between requests.
+
+    Requests and responses are JSON-compatible dictionaries, so the service can be used in-process
+    or behind `serve` by any client. Strategies are given either as the name of a built-in
+    strategy class or as a bit string. Payoff matrices are given as a dictionary mapping "CC",
+    "CD", "DC" and "DD" to (player, opponent) payoffs, and default to the standard matrix.
+
+    Matches draw from the global random number generator, so requests are handled one at a time.
+    This keeps seeded tournaments reproducible when requests arrive concurrently.
+
+    Supported operations:
+    - "score": the fitness of each of `genomes` against `opponents`.
+    - "tournament": a round-robin tournament between `strategies` (see `run_tournament`).
+    - "outcomes": the (CC, CD, DC, DD) outcome counts of each (player, opponent) pair in `pairs`.
+    """
+    def __init__(self, processes: Optional[int] = None):
+        """
+        Initializes the service.
+
+        Args:
+            processes: The number of worker processes used for tournament replicates, or None to
+                use the CPU count (default: None).
+        """
+        self.processes = processes
+        self.pool = None
+        self.strategy_tables: Dict[Tuple[str, int], List[int]] = {}
+        self.strategy_classes = {
+            strategy.__name__: strategy for strategy in Strategy.__subclasses__()
+        }
+        self.lock = threading.Lock()
+        self.evaluation_lock = threading.Lock()
+
+    def handle(self, request: Union[Dict, List[Dict]]) -> Union[Dict, List[Dict]]:
+        """
+        Handles a request, or a batch of requests.
+
+        Args:
+            request: A request dictionary with an "op" key, or a list of them.
+
+        Returns:
+            The response dictionary, or a list of them. Failed requests return a dictionary with
+            an "error" key.
+        """
+        if isinstance(request, list):
+            return [self.handle(single_request) for single_request in request]
+
+        handlers = {
+            "score": self._score,
+            "tournament": self._tournament,
+            "outcomes": self._outcomes
+        }
+        op = request.get("op") if isinstance(request, dict) else None
+        if op not in handlers:
+            return {"error": f"Unknown operation: {op}"}
+
+        try:
+            with self.evaluation_lock:
+                return handlers[op](request)
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            return {"error": f"{type(e).__name__}: {e}"}
+
+    def close(self) -> None:
+        """
+        Shuts down the worker pool.
+        """
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool = None
+
+    def _score(self, request: Dict) -> Dict:
+        memory_size = request["memory_size"]
+        opponents = self._get_strategies(request["opponents"], memory_size)
+        payoff_matrix = _decode_payoff_matrix(request.get("payoff_matrix"))
+
+        return {
+            "scores": [
+                fitness(
+                    genome,
+                    opponents,
+                    memory_size,
+                    request["rounds"],
+                    payoff_matrix,
+                    request.get("noise_rate", 0.0)
+                )
+                for genome in self._get_strategies(request["genomes"], memory_size)
+            ]
+        }
+
+    def _tournament(self, request: Dict) -> Dict:
+        memory_size = request["memory_size"]
+        replicates = request.get("replicates", 1)
+
+        pool = None
+        if replicates > 1 and request.get("noise_rate", 0.0) > 0 and self.processes != 1:
+            pool = self._get_pool()
+
+        return run_tournament(
+            self._get_strategies(request["strategies"], memory_size),
+            memory_size,
+            request["rounds"],
+            _decode_payoff_matrix(request.get("payoff_matrix")),
+            request.get("noise_rate", 0.0),
+            replicates,
+            processes=1,
+            seed=request.get("seed"),
+            self_play=request.get("self_play", False),
+            pool=pool
+        )
+
+    def _outcomes(self, request: Dict) -> Dict:
+        memory_size = request["memory_size"]
+
+        return {
+            "outcomes": [
+                list(get_outcome_counts(
+                    *self._get_strategies(pair, memory_size),
+                    memory_size,
+                    request["rounds"],
+                    request.get("noise_rate", 0.0)
+                ))
+                for pair in request["pairs"]
+            ]
+        }
+
+    def _get_strategies(
+        self,
+        strategies: List[Union[str, List[int]]],
+        memory_size: int
+    ) -> List[List[int]]:
+        """
+        Resolves strategy names to their cached bit string representations, and validates bit
+        strings.
+
+        Args:
+            strategies: A list of strategy class names or bit strings.
+            memory_size: The number of past opponent moves each strategy considers.
+
+        Returns:
+            The bit string representations of the strategies.
+
+        Raises:
+            ValueError: If a strategy name is unknown, or a bit string does not have
+                2^(memory_size + 1) - 1 bits of 0 or 1.
+        """
+        genome_length = 2 ** (memory_size + 1) - 1
+
+        representations = []
+        for strategy in strategies:
+            if not isinstance(strategy, str):
+                if len(strategy) != genome_length or any(bit not in (0, 1) for bit in strategy):
+                    raise ValueError(
+                        f"Bit strings for memory size {memory_size} must have {genome_length} "
+                        "bits of 0 or 1."
+                    )
+                representations.append(strategy)
+                continue
+
+            key = (strategy, memory_size)
+            if key not in self.strategy_tables:
+                if strategy not in self.strategy_classes:
+                    raise ValueError(f"Unknown strategy: {strategy}")
+                self.strategy_tables[key] = get_bit_representations_for_strategies(
+                    [self.strategy_classes[strategy]], memory_size
+                )[0]
+            representations.append(self.strategy_tables[key])
+
+        return representations
+
+    def _get_pool(self) -> Pool:
+        with self.lock:
+            if self.pool is None:
+                self.pool = Pool(self.processes)
+            return self.pool
+
+
+class TournamentClient:
+    """
+    A client for a `TournamentService` served by `serve`, falling back to an in-process service
+    when no address is given or the server cannot be reached.
+    """
+    def __init__(self, address: Optional[str] = None):
+        """
+        Connects to a served tournament service.
+
+        Args:
+            address: The path of a Unix socket or a "host:port" address, or None to use an
+                in-process service (default: None).
+        """
+        self.connection = None
+        self.service = None
+
+        if address is not None:
+            try:
+                if ":" in address:
+                    self.connection = socket.create_connection(_parse_tcp_address(address))
+                else:
+                    self.connection = _connect_unix(address)
+                self.reader = self.connection.makefile("r")
+            except OSError:
+                self.connection = None
+
+        if self.connection is None:
+            self.service = TournamentService()
+
+    def request(self, request: Union[Dict, List[Dict]]) -> Union[Dict, List[Dict]]:
+        """
+        Sends a request, or a batch of requests, to the service.
+
+        Args:
+            request: A request dictionary with an "op" key, or a list of them.
+
+        Returns:
+            The response dictionary, or a list of them.
+        """
+        if self.service is not None:
+            # Round-trip through JSON so both modes return the same types
+            return json.loads(json.dumps(self.service.handle(json.loads(json.dumps(request)))))
+
+        self.connection.sendall((json.dumps(request) + "\n").encode())
+        return json.loads(self.reader.readline())
+
+    def close(self) -> None:
+        """
+        Closes the connection, or the in-process service.
+        """
+        if self.connection is not None:
+            self.reader.close()
+            self.connection.close()
+        if self.service is not None:
+            self.service.close()
+
+    def __enter__(self) -> "TournamentClient":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def serve(address: str, processes: Optional[int] = None) -> None:
+    """
+    Serves a `TournamentService` on a Unix socket or a localhost TCP port until interrupted.
+
+    Each connection sends requests as JSON documents, one per line, and receives one JSON response
+    line per request.
+
+    Args:
+        address: The path of a Unix socket or a "host:port" address.
+        processes: The number of worker processes used for tournament replicates, or None to use
+            the CPU count (default: None).
+    """
+    service = TournamentService(processes)
+    server = create_server(address, service)
+
+    try:
+        with server:
+            server.serve_forever()
+    finally:
+        service.close()
+
+
+def create_server(address: str, service: TournamentService) -> socketserver.BaseServer:
+    """
+    Creates a server for a `TournamentService` on a Unix socket or a localhost TCP port.
+
+    Args:
+        address: The path of a Unix socket or a "host:port" address.
+        service: The service handling the requests.
+
+    Returns:
+        The server, ready to `serve_forever`.
+    """
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                try:
+                    response = service.handle(json.loads(line))
+                except json.JSONDecodeError as e:
+                    response = {"error": f"JSONDecodeError: {e}"}
+                self.wfile.write((json.dumps(response) + "\n").encode())
+
+    if ":" in address:
+        return socketserver.ThreadingTCPServer(_parse_tcp_address(address), Handler)
+
+    if os.path.exists(address):
+        os.remove(address)
+    return socketserver.ThreadingUnixStreamServer(address, Handler)
+
+
+def _decode_payoff_matrix(
+    payoff_matrix: Optional[Dict[str, List[int]]]
+) -> Dict[Tuple[int, int], Tuple[int, int]]:
+    """
+    Decodes a payoff matrix from its JSON-compatible form.
+
+    Args:
+        payoff_matrix: A dictionary mapping "CC", "CD", "DC" and "DD" to (player, opponent)
+            payoffs, or None for the default payoff matrix.
+
+    Returns:
+        A dictionary representing a payoff matrix.
+    """
+    if payoff_matrix is None:
+        return DEFAULT_PAYOFF_MATRIX
+    return {OUTCOME_NAMES[name]: tuple(payoffs) for name, payoffs in payoff_matrix.items()}
+
+
+def _parse_tcp_address(address: str) -> Tuple[str, int]:
+    host, port = address.rsplit(":", 1)
+    return host or "localhost", int(port)
+
+
+def _connect_unix(path: str) -> socket.socket:
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(path)
+    except OSError:
+        connection.close()
+        raise
+    return connection
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serves a local IPD tournament service.")
+    parser.add_argument(
+        "--address",
+        default="/tmp/ipd_tournament.sock",
+        help="The path of a Unix socket or a host:port address."
+    )
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    serve(args.address, args.processes)
@@ -1,111 +1,217 @@
 import os
 import json
+from multiprocessing import Pool
+from typing import List, Dict, Tuple, Optional
 import matplotlib.pyplot as plt
 
 
-def analyse_results(results_dir: str, plot_all: bool = False) -> None:
+def analyse_results(
+    results_dir: str,
+    plot_all: bool = False,
+    show: bool = True,
+    max_points: Optional[int] = None
+) -> None:
     """
     Analyses the results of the genetic algorithm and plots data from the results files.
 
     Args:
         results_dir: The directory containing the results JSON files.
         plot_all: Boolean flag to determine if all results or only the best should be plotted.
+        show: Boolean flag to determine if the plots are shown after being saved (default: True).
+        max_points: The maximum number of points plotted per series, or None to plot every
+            generation (default: None).
     """
     results_paths = [
         os.path.join(results_dir, filename)
         for filename in os.listdir(results_dir)
         if filename.endswith(".json")
     ]
+    all_results = _load_results(results_paths)
 
-    if plot_all:
-        plot_fitness(results_paths)
-    else:
-        best_fitness = -float("inf")
-        best_path = None
+    if not plot_all:
+        best_path = max(
+            all_results, key=lambda path: max(all_results[path]["results"]["best_fitness_per_gen"])
+        )
+        all_results = {best_path: all_results[best_path]}
+
+    _plot_results(all_results, show, max_points)
+
+
+def batch_analyse_results(
+    base_dir: str,
+    plot_all: bool = False,
+    processes: Optional[int] = None,
+    max_points: Optional[int] = 1000
+) -> List[str]:
+    """
+    Plots the results of every `env_*` directory under a base directory in parallel.
+
+    Each directory is plotted in a worker process on the non-interactive Agg backend, and the plots
+    are saved without being shown.
 
-        for path in results_paths:
-            with open(path, 'r') as file:
-                results = json.load(file)
-                current_best_fitness = max(results["results"]["best_fitness_per_gen"])
+    Args:
+        base_dir: The directory searched recursively for `env_*` results directories.
+        plot_all: Boolean flag to determine if all results or only the best should be plotted.
+        processes: The number of worker processes, or None to use the CPU count (default: None).
+        max_points: The maximum number of points plotted per series, or None to plot every
+            generation (default: 1000).
+
+    Returns:
+        The list of results directories that were plotted.
+    """
+    results_dirs = sorted(
+        root for root, _, filenames in os.walk(base_dir)
+        if os.path.basename(root).startswith("env_")
+        and any(filename.endswith(".json") for filename in filenames)
+    )
 
-                if current_best_fitness > best_fitness:
-                    best_fitness = current_best_fitness
-                    best_path = path
+    with Pool(processes) as pool:
+        pool.map(
+            _analyse_results_headless,
+            [(results_dir, plot_all, max_points) for results_dir in results_dirs]
+        )
 
-        plot_fitness([best_path])
+    return results_dirs
 
 
-def plot_fitness(results_paths: list) -> None:
+def plot_fitness(
+    results_paths: list,
+    show: bool = True,
+    max_points: Optional[int] = None
+) -> None:
     """
     Plots the fitness scores (average and best) per generation from one or more result files.
 
     Args:
         results_paths: A list of paths to the results JSON files.
+        show: Boolean flag to determine if the plots are shown after being saved (default: True).
+        max_points: The maximum number of points plotted per series, or None to plot every
+            generation (default: None).
     """
-    # Plot average fitness
-    plt.figure(figsize=(10, 6))
-    for results_path in results_paths:
-        with open(results_path, 'r') as file:
-            results = json.load(file)
+    _plot_results(_load_results(results_paths), show, max_points)
 
-        avg_fitness = results["results"]["avg_fitness_per_gen"]
-        generations = range(len(avg_fitness))
 
-        # Create label
-        memory_size = results["config"]["memory_size"]
-        noise_rate = results["config"]["noise_rate"]
+def downsample_min_max(
+    values: List[float],
+    max_points: int
+) -> Tuple[List[int], List[float]]:
+    """
+    Downsamples a series while preserving its extremes.
 
-        plt.plot(
-            generations,
-            avg_fitness,
-            label=f"Mem={memory_size}, Noise={noise_rate}",
-            linewidth=2,
-            alpha=0.7
-        )
+    The series is split into max_points / 2 buckets, and the minimum and maximum of each bucket are
+    kept in their original order, so peaks and troughs remain visible in the plot.
 
-    plt.xlabel("Generations")
-    plt.ylabel("Average Fitness")
-    plt.title("Average Fitness vs Generations")
-    plt.legend()
-    plt.grid(True)
+    Args:
+        values: The series to downsample.
+        max_points: The maximum number of points to keep, at least 2.
 
-    avg_plot_path = os.path.join(
-        os.path.dirname(results_paths[0]), "plots", "avg_fitness_comparison.png"
-    )
-    os.makedirs(os.path.dirname(avg_plot_path), exist_ok=True)
-    plt.savefig(avg_plot_path, bbox_inches="tight")
-    plt.show()
+    Returns:
+        A tuple containing the indices and values of the kept points.
 
-    # Plot best fitness
-    plt.figure(figsize=(10, 6))
-    for results_path in results_paths:
-        with open(results_path, 'r') as file:
-            results = json.load(file)
+    Raises:
+        ValueError: If max_points is less than 2, since a bucket keeps both of its extremes.
+    """
+    if max_points < 2:
+        raise ValueError("At least 2 points must be kept.")
 
-        best_fitness = results["results"]["best_fitness_per_gen"]
-        generations = range(len(best_fitness))
+    if len(values) <= max_points:
+        return list(range(len(values))), list(values)
 
-        # Create label
-        memory_size = results["config"]["memory_size"]
-        noise_rate = results["config"]["noise_rate"]
+    num_buckets = max_points // 2
+    bucket_size = len(values) / num_buckets
 
-        plt.plot(
-            generations,
-            best_fitness,
-            label=f"Mem={memory_size}, Noise={noise_rate}",
-            linewidth=2,
-            alpha=0.7
-        )
+    indices = []
+    for bucket in range(num_buckets):
+        start = int(bucket * bucket_size)
+        end = int((bucket + 1) * bucket_size)
+        bucket_indices = range(start, end)
 
-    plt.xlabel("Generations")
-    plt.ylabel("Best Fitness")
-    plt.title("Best Fitness vs Generations")
-    plt.legend()
-    plt.grid(True)
+        min_idx = min(bucket_indices, key=values.__getitem__)
+        max_idx = max(bucket_indices, key=values.__getitem__)
+        indices.extend(sorted({min_idx, max_idx}))
 
-    best_plot_path = os.path.join(
-        os.path.dirname(results_paths[0]), "plots", "best_fitness_comparison.png"
-    )
-    os.makedirs(os.path.dirname(best_plot_path), exist_ok=True)
-    plt.savefig(best_plot_path, bbox_inches="tight")
-    plt.show()
+    return indices, [values[i] for i in indices]
+
+
+def _analyse_results_headless(task: Tuple[str, bool, Optional[int]]) -> None:
+    """
+    Analyses a results directory on the non-interactive Agg backend, without showing the plots.
+
+    Args:
+        task: A tuple (results_dir, plot_all, max_points).
+    """
+    plt.switch_backend("Agg")
+    results_dir, plot_all, max_points = task
+    analyse_results(results_dir, plot_all, show=False, max_points=max_points)
+
+
+def _load_results(results_paths: List[str]) -> Dict[str, Dict]:
+    """
+    Loads results JSON files.
+
+    Args:
+        results_paths: A list of paths to the results JSON files.
+
+    Returns:
+        A dictionary mapping each path to its results.
+    """
+    all_results = {}
+    for results_path in results_paths:
+        with open(results_path, 'r') as file:
+            all_results[results_path] = json.load(file)
+    return all_results
+
+
+def _plot_results(
+    all_results: Dict[str, Dict],
+    show: bool,
+    max_points: Optional[int]
+) -> None:
+    """
+    Plots the average and best fitness per generation of loaded results.
+
+    Args:
+        all_results: A dictionary mapping each results path to its results.
+        show: Boolean flag to determine if the plots are shown after being saved.
+        max_points: The maximum number of points plotted per series, or None to plot every
+            generation.
+    """
+    plots_dir = os.path.join(os.path.dirname(next(iter(all_results))), "plots")
+
+    for key, label, filename in [
+        ("avg_fitness_per_gen", "Average Fitness", "avg_fitness_comparison.png"),
+        ("best_fitness_per_gen", "Best Fitness", "best_fitness_comparison.png")
+    ]:
+        plt.figure(figsize=(10, 6))
+        for results in all_results.values():
+            fitness = results["results"][key]
+            if max_points is None:
+                generations = range(len(fitness))
+            else:
+                generations, fitness = downsample_min_max(fitness, max_points)
+
+            # Create label
+            memory_size = results["config"]["memory_size"]
+            noise_rate = results["config"]["noise_rate"]
+
+            plt.plot(
+                generations,
+                fitness,
+                label=f"Mem={memory_size}, Noise={noise_rate}",
+                linewidth=2,
+                alpha=0.7
+            )
+
+        plt.xlabel("Generations")
+        plt.ylabel(label)
+        plt.title(f"{label} vs Generations")
+        plt.legend()
+        plt.grid(True)
+
+        plot_path = os.path.join(plots_dir, filename)
+        os.makedirs(plots_dir, exist_ok=True)
+        plt.savefig(plot_path, bbox_inches="tight")
+        if show:
+            plt.show()
+        else:
+            plt.close()
@@ -0,0 +1,23 @@
+import math
+import statistics
+from typing import List, Tuple
+
+# The z-score used for 95% confidence intervals
+CONFIDENCE_Z = 1.96
+
+
+def mean_confidence_interval(sample: List[float]) -> Tuple[float, float]:
+    """
+    Computes the mean of a sample and the half-width of its 95% confidence interval.
+
+    Args:
+        sample: A list of values.
+
+    Returns:
+        A tuple (mean, half_width). The half-width is zero for samples with a single value.
+    """
+    sample_mean = statistics.mean(sample)
+    if len(sample) < 2:
+        return sample_mean, 0.0
+
+    return sample_mean, CONFIDENCE_Z * statistics.stdev(sample) / math.sqrt(len(sample))
@@ -0,0 +1,40 @@
+import json
+import math
+from src.utils.analysis import batch_analyse_results, downsample_min_max
+
+
+def test_downsample_min_max():
+    values = [math.sin(i / 7) * i for i in range(1001)]
+
+    for max_points in [2, 3, 10, 101]:
+        indices, downsampled = downsample_min_max(values, max_points)
+
+        assert len(indices) <= max_points
+        assert indices == sorted(set(indices))
+        assert downsampled == [values[i] for i in indices]
+        assert min(downsampled) == min(values)
+        assert max(downsampled) == max(values)
+
+    # Short series are kept whole
+    assert downsample_min_max(values[:5], 10) == (list(range(5)), values[:5])
+
+
+def test_batch_analyse_results(tmp_path):
+    for memory_size in [1, 2]:
+        results_dir = tmp_path / f"env_{memory_size}"
+        results_dir.mkdir()
+        results = {
+            "results": {
+                "avg_fitness_per_gen": [float(i % 5) for i in range(50)],
+                "best_fitness_per_gen": [float(i) for i in range(50)]
+            },
+            "config": {"memory_size": memory_size, "noise_rate": 0.0}
+        }
+        (results_dir / "results.json").write_text(json.dumps(results))
+
+    results_dirs = batch_analyse_results(str(tmp_path), processes=1, max_points=10)
+
+    assert results_dirs == [str(tmp_path / "env_1"), str(tmp_path / "env_2")]
+    for results_dir in results_dirs:
+        for filename in ["avg_fitness_comparison.png", "best_fitness_comparison.png"]:
+            assert (tmp_path / results_dir / "plots" / filename).exists()
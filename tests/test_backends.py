@@ -0,0 +1,161 @@
+import json
+import random
+from src.ga import backends
+from src.ga.backends import (
+    BACKENDS,
+    ReferenceBackend,
+    get_tuned_backend,
+    register_backend,
+    tune_backend
+)
+from src.ga.crossover import single_point_crossover
+from src.ga.fitness import (
+    cycle_outcome_counts,
+    get_outcome_counts,
+    play_ipd_outcomes,
+    replace_outcome_cache
+)
+from src.ga.genetic_algorithm import GeneticAlgorithm
+from src.ga.mutation import bit_flip_mutation
+from src.ga.strategies import AlwaysDefect, TitForTat
+
+
+def test_cycle_outcome_counts():
+    random.seed(0)
+    for memory_size in range(4):
+        for rounds in [0, 1, 7, 50]:
+            genome_length = 2 ** (memory_size + 1) - 1
+            player = [random.randint(0, 1) for _ in range(genome_length)]
+            opponent = [random.randint(0, 1) for _ in range(genome_length)]
+
+            assert cycle_outcome_counts(player, opponent, memory_size, rounds) == \
+                play_ipd_outcomes(player, opponent, memory_size, rounds)
+
+
+def test_tune_backend():
+    memory_size = 2
+    rounds = 20
+    payoff_matrix = {
+        (0, 0): (3, 3),  # Both cooperate
+        (0, 1): (0, 5),  # Player cooperates, opponent defects
+        (1, 0): (5, 0),  # Player defects, opponent cooperates
+        (1, 1): (1, 1)   # Both defect
+    }
+
+    @register_backend
+    class InexactBackend(ReferenceBackend):
+        name = "inexact"
+
+        def play(self, *args, **kwargs):
+            return 0, 0
+
+    random.seed(0)
+    genomes = [[random.randint(0, 1) for _ in range(7)] for _ in range(6)]
+
+    try:
+        for noise_rate in [0.0, 0.1]:
+            state = random.getstate()
+            cache = replace_outcome_cache({})
+            backend, timings = tune_backend(
+                genomes, genomes, memory_size, rounds, payoff_matrix, noise_rate
+            )
+
+            # Tuning leaves the random number stream and the outcome cache untouched
+            assert random.getstate() == state
+            assert len(replace_outcome_cache(cache)) == 0
+
+            assert backend.name != "inexact"
+            assert "inexact" in timings
+            assert ("cycle" in timings) == (noise_rate == 0)
+    finally:
+        del BACKENDS["inexact"]
+
+
+def test_tune_backend_restores_the_outcome_cache():
+    memory_size = 2
+    rounds = 20
+    payoff_matrix = {
+        (0, 0): (3, 3),  # Both cooperate
+        (0, 1): (0, 5),  # Player cooperates, opponent defects
+        (1, 0): (5, 0),  # Player defects, opponent cooperates
+        (1, 1): (1, 1)   # Both defect
+    }
+
+    random.seed(0)
+    genomes = [[random.randint(0, 1) for _ in range(7)] for _ in range(6)]
+
+    # Warm the caller's cache with every sample match
+    previous = replace_outcome_cache({})
+    try:
+        for player in genomes:
+            for opponent in genomes:
+                get_outcome_counts(player, opponent, memory_size, rounds)
+        cache = replace_outcome_cache({})
+        replace_outcome_cache(dict(cache))
+
+        tune_backend(genomes, genomes, memory_size, rounds, payoff_matrix, 0.0)
+
+        # The caller's cache is restored unchanged
+        assert replace_outcome_cache({}) == cache
+    finally:
+        replace_outcome_cache(previous)
+
+
+def test_get_tuned_backend(monkeypatch):
+    payoff_matrix = {
+        (0, 0): (3, 3),  # Both cooperate
+        (0, 1): (0, 5),  # Player cooperates, opponent defects
+        (1, 0): (5, 0),  # Player defects, opponent cooperates
+        (1, 1): (1, 1)   # Both defect
+    }
+    monkeypatch.setattr(backends, "_tuned_backends", {})
+
+    tuned_settings = []
+
+    def record_tune_backend(genomes, opponents, *settings):
+        tuned_settings.append((len(genomes), len(opponents)) + settings)
+        return tune_backend(genomes, opponents, *settings)
+
+    monkeypatch.setattr(backends, "tune_backend", record_tune_backend)
+
+    random.seed(0)
+    choices = []
+    for population_size in [6, 6, 8]:
+        genomes = [[random.randint(0, 1) for _ in range(7)] for _ in range(population_size)]
+        backend, timings = get_tuned_backend(genomes, genomes, 2, 20, payoff_matrix, 0.0)
+        choices.append((backend.name, timings))
+
+    # Runs with the same settings reuse the first choice, and a new population size is tuned
+    assert len(tuned_settings) == 2
+    assert choices[0] == choices[1]
+    assert tuned_settings[1][:2] == (8, 8)
+
+
+def test_backend_results_config(tmp_path):
+    payoff_matrix = {
+        (0, 0): (3, 3),  # Both cooperate
+        (0, 1): (0, 5),  # Player cooperates, opponent defects
+        (1, 0): (5, 0),  # Player defects, opponent cooperates
+        (1, 1): (1, 1)   # Both defect
+    }
+    args = (
+        8, 0.8, single_point_crossover, 0.05, bit_flip_mutation, 2, 2, 0.1, 3,
+        [TitForTat, AlwaysDefect], 2, 10, payoff_matrix, 0.0, False
+    )
+
+    for backend in [None, "reference"]:
+        random.seed(0)
+        ga = GeneticAlgorithm(*args, backend=backend)
+        ga.evolve()
+        ga.save_results(str(tmp_path / "results.json"))
+
+        with open(tmp_path / "results.json", 'r') as file:
+            config = json.load(file)["config"]
+
+        # The backend and its tuning timings are recorded, and tuning is skipped when named
+        assert config["backend"] == ga.backend.name
+        if backend is None:
+            assert ga.backend.name in config["backend_timings"]
+        else:
+            assert config["backend"] == backend
+            assert config["backend_timings"] == {}
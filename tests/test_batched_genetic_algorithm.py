@@ -0,0 +1,90 @@
+import random
+from src.ga.batched_genetic_algorithm import BatchedGeneticAlgorithm, aggregate_fitness_series
+from src.ga.crossover import single_point_crossover
+from src.ga.genetic_algorithm import GeneticAlgorithm
+from src.ga.mutation import bit_flip_mutation
+from src.ga.strategies import AlwaysDefect, TitForTat
+from src.ga.tournament import load_evolved_strategies
+
+
+def test_batched_results_layout(tmp_path):
+    args = (
+        8, 0.8, single_point_crossover, 0.05, bit_flip_mutation, 5, 5, 0.1, 3, [TitForTat],
+        1, 10, {(0, 0): (3, 3), (0, 1): (0, 5), (1, 0): (5, 0), (1, 1): (1, 1)}, 0.0, False
+    )
+    batched_ga = BatchedGeneticAlgorithm(2, 0, *args)
+    batched_ga.evolve()
+    batched_ga.save_results(str(tmp_path / "batched.json"))
+
+    # Batched results can be read like the results of a single run
+    strategies = load_evolved_strategies(str(tmp_path), memory_size=1)
+    assert strategies
+    assert all(len(strategy) == 3 for strategy in strategies.values())
+
+    results = batched_ga.get_results()["results"]
+    assert results["avg_fitness_per_gen"] == results["avg_fitness_band"]["mean"]
+    assert max(results["best_fitness_per_gen"]) <= results["best_fitness"]
+
+
+def test_batched_genetic_algorithm():
+    seed = 42
+    replicates = 3
+    args = (
+        10,                      # population_size
+        0.8,                     # crossover_rate
+        single_point_crossover,
+        0.05,                    # mutation_rate
+        bit_flip_mutation,
+        20,                      # generations
+        5,                       # early_stop_threshold
+        0.1,                     # elitism_rate
+        3,                       # tournament_size
+        [TitForTat, AlwaysDefect],
+        2,                       # memory_size
+        10,                      # rounds
+        {(0, 0): (3, 3), (0, 1): (0, 5), (1, 0): (5, 0), (1, 1): (1, 1)},
+        0.1,                     # noise_rate
+        False                    # co_evolution
+    )
+
+    # Each replicate evolves exactly like a separately seeded run, in worker processes or not
+    for processes in [None, 1]:
+        random.seed(0)
+        state = random.getstate()
+        batched_ga = BatchedGeneticAlgorithm(replicates, seed, *args, processes=processes)
+        batched_ga.evolve()
+        results = batched_ga.get_results()["results"]
+        assert random.getstate() == state
+
+        for replicate in range(replicates):
+            random.seed(seed + replicate)
+            ga = GeneticAlgorithm(*args)
+            ga.evolve()
+            assert results["replicates"][replicate] == ga.get_results()["results"]
+
+
+def test_batched_genetic_algorithm_options():
+    args = (
+        6, 0.8, single_point_crossover, 0.05, bit_flip_mutation, 3, 3, 0.2, 2, [TitForTat],
+        3, 10, {(0, 0): (3, 3), (0, 1): (0, 5), (1, 0): (5, 0), (1, 1): (1, 1)}, 0.1, False
+    )
+    batched_ga = BatchedGeneticAlgorithm(
+        2, 0, *args, sparse_genomes=True, continuation_probability=0.9, processes=1
+    )
+    batched_ga.evolve()
+    config = batched_ga.get_results()["config"]
+
+    # The options reach every replicate, and the backend is tuned once for the batch
+    assert config["sparse_genomes"] and config["continuation_probability"] == 0.9
+    assert config["backend"] in config["backend_timings"]
+    assert len({ga.backend.name for ga in batched_ga.replicate_gas}) == 1
+    assert all(ga.backend_timings == {} for ga in batched_ga.replicate_gas[1:])
+
+
+def test_aggregate_fitness_series():
+    aggregate = aggregate_fitness_series([[1, 2, 3], [3, 4]])
+
+    assert aggregate["mean"] == [2, 3, 3]
+    assert aggregate["count"] == [2, 2, 1]
+    assert aggregate["ci_lower"][2] == aggregate["ci_upper"][2] == 3
+    assert aggregate["ci_lower"][0] < 2 < aggregate["ci_upper"][0]
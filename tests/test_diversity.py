@@ -0,0 +1,55 @@
+import random
+import pytest
+from itertools import combinations
+from src.ga.crossover import single_point_crossover
+from src.ga.diversity import DiversityTracker
+from src.ga.genetic_algorithm import GeneticAlgorithm
+from src.ga.mutation import bit_flip_mutation
+from src.ga.strategies import TitForTat
+
+
+def test_diversity_tracker():
+    random.seed(0)
+    genome_length = 15
+    tracker = DiversityTracker(genome_length)
+    population = [[random.randint(0, 1) for _ in range(genome_length)] for _ in range(12)]
+
+    for _ in range(5):
+        tracker.update(population)
+
+        pairs = list(combinations(population, 2))
+        expected_distance = sum(
+            sum(a != b for a, b in zip(genome1, genome2)) for genome1, genome2 in pairs
+        ) / len(pairs)
+        assert abs(tracker.mean_pairwise_hamming_distance() - expected_distance) < 1e-9
+
+        assert tracker.unique_genomes() == len({tuple(genome) for genome in population})
+        assert tracker.allele_frequencies() == [
+            sum(genome[locus] for genome in population) / len(population)
+            for locus in range(genome_length)
+        ]
+
+        # Keep most individuals, duplicate some and replace the rest
+        population = population[:6] + population[:3] + [
+            [random.randint(0, 1) for _ in range(genome_length)] for _ in range(3)
+        ]
+
+
+def test_genetic_algorithm_diversity():
+    args = (
+        8, 0.8, single_point_crossover, 0.05, bit_flip_mutation, 4, 10, 0.1, 3, [TitForTat],
+        2, 10, {(0, 0): (3, 3), (0, 1): (0, 5), (1, 0): (5, 0), (1, 1): (1, 1)}, 0.0, False
+    )
+
+    random.seed(0)
+    ga = GeneticAlgorithm(*args)
+    ga.evolve()
+    assert len(ga.mean_hamming_distance_per_gen) == len(ga.avg_fitness_per_gen)
+    assert ga.allele_frequencies_per_gen == []
+
+    ga = GeneticAlgorithm(*args, record_allele_frequencies=True)
+    ga.evolve()
+    assert len(ga.allele_frequencies_per_gen) == len(ga.avg_fitness_per_gen)
+
+    with pytest.raises(ValueError):
+        GeneticAlgorithm(*args, sparse_genomes=True, diversity_threshold=0.1)
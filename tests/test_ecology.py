@@ -0,0 +1,34 @@
+import json
+import pytest
+from src.ga.ecology import replicator_dynamics, simulate_ecology
+from src.post_process_ipd import post_process_ecology
+
+
+def test_replicator_dynamics():
+    # AlwaysCooperate vs AlwaysDefect over 10 rounds
+    score_matrix = [
+        [30, 0],
+        [50, 10]
+    ]
+
+    run = replicator_dynamics(score_matrix, [1, 1], generations=1, record_every=1)
+    assert run["trajectory"][0] == [0.5, 0.5]
+    assert abs(run["shares"][0] - 1 / 3) < 1e-12
+    assert abs(run["shares"][1] - 2 / 3) < 1e-12
+    assert not run["converged"]
+
+    ecology = simulate_ecology(score_matrix, generations=10000, num_starts=3, seed=0)
+    assert ecology["fixed_points"] == [[0.0, 1.0]]
+    assert all(run["survivors"] == [1] for run in ecology["runs"])
+
+
+def test_post_process_ecology_requires_self_play(tmp_path):
+    tournament_results_path = tmp_path / "tournament.json"
+    tournament_results = {
+        "AlwaysDefect": {"vs_opponents": {"AlwaysCooperate": {"mean": 50}}},
+        "AlwaysCooperate": {"vs_opponents": {"AlwaysDefect": {"mean": 0}}}
+    }
+    tournament_results_path.write_text(json.dumps(tournament_results))
+
+    with pytest.raises(ValueError):
+        post_process_ecology(str(tournament_results_path))
@@ -1,5 +1,23 @@
-from src.ga.fitness import play_ipd
-from src.ga.strategies import generate_bit_representation, AlwaysDefect, AlwaysCooperate, TitForTat
+import random
+from src.ga.fitness import (
+    discounted_play_ipd,
+    fitness,
+    fitness_for_payoff_matrices,
+    get_outcome_counts,
+    play_ipd,
+    play_ipd_outcomes,
+    replace_outcome_cache,
+    score_outcomes,
+    swap_outcomes
+)
+from src.ga.strategies import (
+    generate_bit_representation,
+    AlwaysDefect,
+    AlwaysCooperate,
+    GrimTrigger,
+    TitForTat
+)
+from src.utils.stats import mean_confidence_interval
 
 
 def test_play_ipd():
@@ -65,3 +83,132 @@ def test_play_ipd():
 
         assert player_score == expected_scores[i][0]
         assert opponent_score == expected_scores[i][1]
+
+
+def test_play_ipd_outcomes():
+    memory_size = 2
+    rounds = 6
+    payoff_matrices = [
+        {(0, 0): (3, 3), (0, 1): (0, 5), (1, 0): (5, 0), (1, 1): (1, 1)},
+        {(0, 0): (4, 4), (0, 1): (0, 6), (1, 0): (6, 0), (1, 1): (2, 2)}
+    ]
+
+    player = generate_bit_representation(TitForTat(), memory_size)
+    opponents = [
+        generate_bit_representation(AlwaysDefect(), memory_size),
+        generate_bit_representation(AlwaysCooperate(), memory_size)
+    ]
+
+    counts = play_ipd_outcomes(player, opponents[0], memory_size, rounds)
+    assert counts == (0, 1, 0, 5)
+    assert swap_outcomes(counts) == (0, 0, 1, 5)
+
+    for payoff_matrix in payoff_matrices:
+        assert score_outcomes(counts, payoff_matrix) == play_ipd(
+            player, opponents[0], memory_size, rounds, payoff_matrix
+        )
+
+    assert fitness_for_payoff_matrices(
+        player, opponents, memory_size, rounds, payoff_matrices, 0.0
+    ) == [
+        fitness(player, opponents, memory_size, rounds, payoff_matrix, 0.0)
+        for payoff_matrix in payoff_matrices
+    ]
+
+
+def test_noise_free_matches_draw_no_random_numbers():
+    memory_size = 2
+    rounds = 10
+    player = generate_bit_representation(TitForTat(), memory_size)
+    opponent = generate_bit_representation(AlwaysDefect(), memory_size)
+
+    previous = replace_outcome_cache({})
+    try:
+        # Simulated and cached matches leave the random number stream in the same state
+        for _ in range(2):
+            state = random.getstate()
+            get_outcome_counts(player, opponent, memory_size, rounds)
+            assert random.getstate() == state
+
+        state = random.getstate()
+        play_ipd_outcomes(player, opponent, memory_size, rounds, 0.1)
+        assert random.getstate() != state
+    finally:
+        replace_outcome_cache(previous)
+
+
+def test_discounted_play_ipd():
+    memory_size = 2
+    continuation_probability = 0.9
+    payoff_matrix = {
+        (0, 0): (3, 3),  # Both cooperate
+        (0, 1): (0, 5),  # Player cooperates, opponent defects
+        (1, 0): (5, 0),  # Player defects, opponent cooperates
+        (1, 1): (1, 1)   # Both defect
+    }
+
+    player = generate_bit_representation(TitForTat(), memory_size)
+    opponent = generate_bit_representation(AlwaysDefect(), memory_size)
+
+    # TitForTat is exploited once, then both defect forever
+    player_score, opponent_score = discounted_play_ipd(
+        player, opponent, memory_size, payoff_matrix, continuation_probability
+    )
+    assert abs(player_score - 0.9 / (1 - 0.9)) < 1e-9
+    assert abs(opponent_score - (5 + 0.9 / (1 - 0.9))) < 1e-9
+
+    # A noisy match converges to the noise-free one as the noise vanishes
+    noisy_scores = discounted_play_ipd(
+        player, opponent, memory_size, payoff_matrix, continuation_probability, 1e-9
+    )
+    assert abs(noisy_scores[0] - player_score) < 1e-6
+    assert abs(noisy_scores[1] - opponent_score) < 1e-6
+
+    # With noise 0.5 every outcome is equally likely in every round
+    random_scores = discounted_play_ipd(
+        player, opponent, memory_size, payoff_matrix, continuation_probability, 0.5
+    )
+    assert abs(random_scores[0] - 2.25 / (1 - 0.9)) < 1e-9
+    assert abs(random_scores[1] - 2.25 / (1 - 0.9)) < 1e-9
+
+
+def test_discounted_play_ipd_monte_carlo():
+    memory_size = 2
+    continuation_probability = 0.9
+    noise_rate = 0.1
+    payoff_matrix = {
+        (0, 0): (3, 3),  # Both cooperate
+        (0, 1): (0, 5),  # Player cooperates, opponent defects
+        (1, 0): (5, 0),  # Player defects, opponent cooperates
+        (1, 1): (1, 1)   # Both defect
+    }
+
+    player = generate_bit_representation(TitForTat(), memory_size)
+    opponent = generate_bit_representation(GrimTrigger(), memory_size)
+
+    cache = {}
+    previous = replace_outcome_cache(cache)
+    try:
+        expected_scores = discounted_play_ipd(
+            player, opponent, memory_size, payoff_matrix, continuation_probability, noise_rate
+        )
+    finally:
+        replace_outcome_cache(previous)
+
+    # The expected outcome counts are cached by genome pair, continuation probability and noise
+    assert len(cache) == 1
+
+    # Sample match lengths and noisy matches
+    random.seed(0)
+    samples = []
+    for _ in range(10000):
+        rounds = 1
+        while random.random() < continuation_probability:
+            rounds += 1
+        samples.append(
+            play_ipd(player, opponent, memory_size, rounds, payoff_matrix, noise_rate)
+        )
+
+    for k in range(2):
+        sample_mean, half_width = mean_confidence_interval([sample[k] for sample in samples])
+        assert abs(sample_mean - expected_scores[k]) < 2 * half_width
@@ -0,0 +1,66 @@
+import random
+from src.ga.crossover import single_point_crossover
+from src.ga.genetic_algorithm import GeneticAlgorithm
+from src.ga.history import PopulationRecorder, PopulationHistory, pack_genome, unpack_genome
+from src.ga.mutation import bit_flip_mutation
+from src.ga.strategies import TitForTat
+
+
+def test_pack_genome():
+    genomes = [[], [1], [0, 1, 1], [1, 0, 1, 1, 0, 0, 1, 0, 1]]
+
+    for genome in genomes:
+        packed = pack_genome(genome)
+        assert len(packed) == (len(genome) + 7) // 8
+        assert unpack_genome(packed, len(genome)) == genome
+
+
+def test_population_history(tmp_path):
+    path = str(tmp_path / "history.bin")
+    generations = [
+        ([[0, 1, 1], [1, 0, 0]], [10.0, 2.5], None),
+        ([[0, 1, 1], [0, 1, 0]], [10.0, 7.0], [(0, -1), (0, 1)])
+    ]
+
+    with PopulationRecorder(path, 5, 2, 3) as recorder:
+        for population, fitness_scores, parents in generations:
+            recorder.record(population, fitness_scores, parents)
+
+    with PopulationHistory(path) as history:
+        assert len(history) == 2
+
+        population, fitness_scores, parents = history.read_generation(1)
+        assert population == [[0, 1, 1], [0, 1, 0]]
+        assert fitness_scores == [10.0, 7.0]
+        assert parents == [(0, -1), (0, 1)]
+
+        assert [generation[2] for generation in history.read_generations()] == [
+            [(-1, -1), (-1, -1)], [(0, -1), (0, 1)]
+        ]
+
+
+def test_genetic_algorithm_history(tmp_path):
+    path = str(tmp_path / "history.bin")
+    payoff_matrix = {
+        (0, 0): (3, 3),  # Both cooperate
+        (0, 1): (0, 5),  # Player cooperates, opponent defects
+        (1, 0): (5, 0),  # Player defects, opponent cooperates
+        (1, 1): (1, 1)   # Both defect
+    }
+
+    random.seed(0)
+    ga = GeneticAlgorithm(
+        6, 0.8, single_point_crossover, 0.05, bit_flip_mutation, 4, 10, 0.2, 2, [TitForTat],
+        1, 5, payoff_matrix, 0.0, False, history_path=path
+    )
+    ga.evolve(2)
+    assert ga.history_recorder is not None
+
+    # The history file is closed once it is full, and later generations are not recorded
+    ga.evolve()
+    assert ga.history_recorder is None
+
+    with PopulationHistory(path) as history:
+        assert len(history) == 4
+        _, fitness_scores, parents = history.read_generation(3)
+        assert len(fitness_scores) == len(parents) == 6
@@ -0,0 +1,109 @@
+import random
+from src.ga.crossover import single_point_crossover
+from src.ga.fitness import fitness
+from src.ga.genetic_algorithm import GeneticAlgorithm
+from src.ga.interning import GenomePool
+from src.ga.mutation import bit_flip_mutation
+
+
+def test_genome_pool():
+    pool = GenomePool()
+    record = pool.intern([0, 1, 1])
+
+    assert record == (0, 1, 1)
+    assert pool.intern([0, 1, 1]) is record
+    assert pool.intern((0, 1, 1)) is record
+
+    pool.retain([pool.intern([1, 1, 1])])
+    assert len(pool) == 1
+    assert pool.intern([0, 1, 1]) is not record
+
+
+def test_deduplicated_co_evolution_fitness():
+    memory_size = 2
+    rounds = 10
+    payoff_matrix = {
+        (0, 0): (3, 3),  # Both cooperate
+        (0, 1): (0, 5),  # Player cooperates, opponent defects
+        (1, 0): (5, 0),  # Player defects, opponent cooperates
+        (1, 1): (1, 1)   # Both defect
+    }
+
+    random.seed(0)
+    ga = GeneticAlgorithm(
+        12, 0.8, single_point_crossover, 0.05, bit_flip_mutation, 10, 10, 0.1, 3, [],
+        memory_size, rounds, payoff_matrix, 0.0, True
+    )
+
+    # Duplicate some individuals
+    population = ga.population[:6] * 2
+    ga.population = [ga.genome_pool.intern(list(individual)) for individual in population]
+
+    assert ga._get_fitness_scores() == [
+        fitness(
+            population[i],
+            population[:i] + population[i+1:],
+            memory_size,
+            rounds,
+            payoff_matrix,
+            0.0
+        )
+        for i in range(len(population))
+    ]
+
+
+def test_noisy_co_evolution_fitness():
+    memory_size = 2
+    rounds = 10
+    noise_rate = 0.1
+    payoff_matrix = {
+        (0, 0): (3, 3),  # Both cooperate
+        (0, 1): (0, 5),  # Player cooperates, opponent defects
+        (1, 0): (5, 0),  # Player defects, opponent cooperates
+        (1, 1): (1, 1)   # Both defect
+    }
+
+    random.seed(0)
+    ga = GeneticAlgorithm(
+        12, 0.8, single_point_crossover, 0.05, bit_flip_mutation, 10, 10, 0.1, 3, [],
+        memory_size, rounds, payoff_matrix, noise_rate, True
+    )
+    population = ga.population[:6] * 2
+    ga.population = [ga.genome_pool.intern(list(individual)) for individual in population]
+
+    # Noisy matches are sampled separately for every individual, even for copies
+    random.seed(1)
+    scores = ga._get_fitness_scores()
+    random.seed(1)
+    assert scores == [
+        fitness(
+            population[i],
+            population[:i] + population[i+1:],
+            memory_size,
+            rounds,
+            payoff_matrix,
+            noise_rate
+        )
+        for i in range(len(population))
+    ]
+
+
+def test_operators_receive_lists():
+    def in_place_mutation(individual, mutation_rate):
+        assert isinstance(individual, list)
+        individual[0] = 1 - individual[0]
+        return individual
+
+    def in_place_crossover(parent1, parent2):
+        assert isinstance(parent1, list) and isinstance(parent2, list)
+        parent1[1], parent2[1] = parent2[1], parent1[1]
+        return parent1, parent2
+
+    random.seed(0)
+    ga = GeneticAlgorithm(
+        6, 0.8, in_place_crossover, 0.05, in_place_mutation, 3, 10, 0.2, 2, [],
+        1, 5, {(0, 0): (3, 3), (0, 1): (0, 5), (1, 0): (5, 0), (1, 1): (1, 1)}, 0.0, True
+    )
+    ga.evolve()
+
+    assert all(isinstance(individual, tuple) for individual in ga.population)
@@ -0,0 +1,81 @@
+import json
+import random
+import pytest
+from src.ga.crossover import single_point_crossover
+from src.ga.genetic_algorithm import GeneticAlgorithm
+from src.ga.mutation import bit_flip_mutation
+from src.ga.strategies import AlwaysDefect, TitForTat
+from src.main import _successive_halving, run_ga
+
+
+def _make_candidates(tmp_path, num_candidates, generations):
+    payoff_matrix = {
+        (0, 0): (3, 3),  # Both cooperate
+        (0, 1): (0, 5),  # Player cooperates, opponent defects
+        (1, 0): (5, 0),  # Player defects, opponent cooperates
+        (1, 1): (1, 1)   # Both defect
+    }
+
+    random.seed(0)
+    candidates = []
+    for k in range(num_candidates):
+        ga = GeneticAlgorithm(
+            8, 0.8, single_point_crossover, 0.1 * (k + 1), bit_flip_mutation, generations,
+            generations, 0.1, 3, [TitForTat, AlwaysDefect], 2, 10, payoff_matrix, 0.0, False
+        )
+
+        # Record the generation each call to evolve starts from
+        ga.evolve_starts = []
+
+        def evolve(generations=None, ga=ga, evolve=ga.evolve):
+            ga.evolve_starts.append(len(ga.avg_fitness_per_gen))
+            evolve(generations)
+
+        ga.evolve = evolve
+        candidates.append((ga, str(tmp_path / f"{k}.json")))
+
+    return candidates
+
+
+def test_successive_halving(tmp_path):
+    candidates = _make_candidates(tmp_path, 4, 8)
+    _successive_halving(candidates, 8, 2, 0.5, "best_fitness")
+
+    generations_run = {}
+    for ga, results_path in candidates:
+        with open(results_path, 'r') as file:
+            results = json.load(file)["results"]
+
+        # Saved results hold every generation run, including for discarded candidates
+        assert results["avg_fitness_per_gen"] == [
+            round(fitness, 4) for fitness in ga.avg_fitness_per_gen
+        ]
+        generations_run[results_path] = len(ga.avg_fitness_per_gen)
+
+        # Candidates continue from their existing state
+        assert ga.evolve_starts == sorted(set(ga.evolve_starts))
+        assert ga.evolve_starts[0] == 0
+
+    assert sorted(generations_run.values()) == [2, 2, 4, 8]
+
+
+def test_successive_halving_validation(tmp_path, monkeypatch):
+    # Invalid settings are rejected before any genetic algorithm is built
+    def build(*args):
+        raise AssertionError("A genetic algorithm was built")
+
+    monkeypatch.setattr("src.main.GeneticAlgorithm", build)
+
+    for min_generations, keep_fraction, halving_metric in [
+        (2, 1.0, "best_fitness"), (0, 0.5, "avg_fitness"), (2, 0.5, "worst_fitness")
+    ]:
+        for opponent_environments in [[[TitForTat]], []]:
+            with pytest.raises(ValueError):
+                run_ga(
+                    str(tmp_path),
+                    opponent_environments=opponent_environments,
+                    successive_halving=True,
+                    min_generations=min_generations,
+                    keep_fraction=keep_fraction,
+                    halving_metric=halving_metric
+                )
@@ -0,0 +1,85 @@
+import threading
+from src.ga.fitness import fitness
+from src.ga.strategies import AlwaysDefect, TitForTat, get_bit_representations_for_strategies
+from src.service import TournamentClient, TournamentService, create_server
+
+
+def test_tournament_client_in_process():
+    memory_size = 2
+    rounds = 10
+    payoff_matrix = {
+        (0, 0): (3, 3),  # Both cooperate
+        (0, 1): (0, 5),  # Player cooperates, opponent defects
+        (1, 0): (5, 0),  # Player defects, opponent cooperates
+        (1, 1): (1, 1)   # Both defect
+    }
+    tit_for_tat, always_defect = get_bit_representations_for_strategies(
+        [TitForTat, AlwaysDefect], memory_size
+    )
+
+    with TournamentClient() as client:
+        responses = client.request([
+            {
+                "op": "score",
+                "genomes": [tit_for_tat, always_defect],
+                "opponents": ["TitForTat", always_defect],
+                "memory_size": memory_size,
+                "rounds": rounds
+            },
+            {
+                "op": "outcomes",
+                "pairs": [["TitForTat", "AlwaysDefect"]],
+                "memory_size": memory_size,
+                "rounds": rounds
+            },
+            {"op": "unknown"}
+        ])
+
+    assert responses[0]["scores"] == [
+        fitness(genome, [tit_for_tat, always_defect], memory_size, rounds, payoff_matrix, 0.0)
+        for genome in [tit_for_tat, always_defect]
+    ]
+    assert responses[1]["outcomes"] == [[0, 1, 0, 9]]
+    assert "error" in responses[2]
+
+
+def test_tournament_client_unix_socket(tmp_path):
+    address = str(tmp_path / "service.sock")
+    service = TournamentService(processes=1)
+    server = create_server(address, service)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+
+    tournament = {
+        "op": "tournament",
+        "strategies": ["TitForTat", "AlwaysDefect", "AlwaysCooperate"],
+        "memory_size": 1,
+        "rounds": 20,
+        "noise_rate": 0.1,
+        "replicates": 3,
+        "seed": 7
+    }
+
+    try:
+        with TournamentClient(address) as client:
+            assert client.service is None
+
+            # Malformed genomes return an error without closing the connection
+            response = client.request({
+                "op": "score",
+                "genomes": [[0, 1]],
+                "opponents": ["TitForTat"],
+                "memory_size": 2,
+                "rounds": 10
+            })
+            assert "error" in response
+
+            # Seeded tournaments are reproducible
+            assert client.request(tournament) == client.request(tournament)
+            with TournamentClient() as local_client:
+                assert client.request(tournament) == local_client.request(tournament)
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+        service.close()
@@ -0,0 +1,104 @@
+import random
+import pytest
+from src.ga.crossover import single_point_crossover
+from src.ga.genetic_algorithm import GeneticAlgorithm
+from src.ga.mutation import bit_flip_mutation
+from src.ga.sparse_genome import SparseGenome
+from src.ga.strategies import TitForTat
+from src.ga.tournament import load_evolved_strategies
+
+
+def test_sparse_genome():
+    length = 2 ** 5 - 1
+    parent1 = SparseGenome(length, seed=1)
+    parent2 = SparseGenome(length, seed=2)
+
+    # Entries are deterministic in the seed
+    assert list(parent1) == list(SparseGenome(length, seed=1))
+    assert set(parent1) == {0, 1}
+
+    # Slicing and concatenation behave like lists
+    bits1, bits2 = list(parent1), list(parent2)
+    assert list(parent1[3:10]) == bits1[3:10]
+    assert list(parent1[:7] + parent2[7:]) == bits1[:7] + bits2[7:]
+
+    random.seed(0)
+    child1, child2 = single_point_crossover(parent1, parent2)
+    random.seed(0)
+    list_child1, list_child2 = single_point_crossover(bits1, bits2)
+    assert list(child1) == list_child1
+    assert list(child2) == list_child2
+
+    # Mutations are stored as a flip layer per segment, applied when entries are read
+    mutant = bit_flip_mutation(child1, 0.2)
+    assert [len(flips) for _, _, _, flips in mutant.segments] == [1] * len(child1.segments)
+    assert 0 < sum(a != b for a, b in zip(mutant, child1)) < length
+    assert list(mutant[5:20]) == list(mutant)[5:20]
+    assert list(mutant[:9] + mutant[9:]) == list(mutant)
+    assert mutant[:9] + mutant[9:] == mutant
+
+    assert bit_flip_mutation(child1, 0.0) is child1
+    assert [1 - bit for bit in child1] == list(bit_flip_mutation(child1, 1.0))
+
+
+def test_sparse_genome_segments():
+    length = 2 ** 4 - 1
+    parent1 = SparseGenome(length, seed=1)
+    parent2 = SparseGenome(length, seed=2)
+
+    # Rejoining adjacent pieces of a genome merges their segments
+    assert parent1[:3] + parent1[3:] == parent1
+    assert (parent1[:3] + parent1[3:]).segments == [(0, 1, 0, ())]
+
+    child = parent1[:5] + parent2[5:]
+    grandchild = child[:2] + parent1[2:]
+    assert grandchild.segments == [(0, 1, 0, ())]
+    assert list(grandchild) == list(parent1)
+
+
+def test_sparse_genetic_algorithm_results(tmp_path):
+    payoff_matrix = {
+        (0, 0): (3, 3),  # Both cooperate
+        (0, 1): (0, 5),  # Player cooperates, opponent defects
+        (1, 0): (5, 0),  # Player defects, opponent cooperates
+        (1, 1): (1, 1)   # Both defect
+    }
+
+    random.seed(0)
+    ga = GeneticAlgorithm(
+        6, 0.8, single_point_crossover, 0.05, bit_flip_mutation, 3, 10, 0.2, 2, [TitForTat],
+        3, 10, payoff_matrix, 0.0, False, sparse_genomes=True
+    )
+    ga.evolve()
+    ga.save_results(str(tmp_path / "results.json"))
+
+    # Sparse best solutions are saved as bit strings
+    strategies = load_evolved_strategies(str(tmp_path), memory_size=3)
+    assert sorted(map(tuple, strategies.values())) == sorted(set(map(tuple, ga.best_solutions)))
+
+
+def test_sparse_genome_mutation_rate():
+    length = 2 ** 12 - 1
+    genome = SparseGenome(length, seed=1)
+
+    # Each entry is flipped with the mutation rate, independently across mutations
+    random.seed(0)
+    mutant = genome.mutate(0.1).mutate(0.1)
+    flipped = sum(a != b for a, b in zip(mutant, genome)) / length
+    assert abs(flipped - 2 * 0.1 * 0.9) < 0.03
+
+
+def test_sparse_genetic_algorithm_rejects_history(tmp_path):
+    payoff_matrix = {
+        (0, 0): (3, 3),  # Both cooperate
+        (0, 1): (0, 5),  # Player cooperates, opponent defects
+        (1, 0): (5, 0),  # Player defects, opponent cooperates
+        (1, 1): (1, 1)   # Both defect
+    }
+
+    with pytest.raises(ValueError):
+        GeneticAlgorithm(
+            6, 0.8, single_point_crossover, 0.05, bit_flip_mutation, 3, 10, 0.2, 2, [TitForTat],
+            3, 10, payoff_matrix, 0.0, False, history_path=str(tmp_path / "history.bin"),
+            sparse_genomes=True
+        )
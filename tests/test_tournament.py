@@ -0,0 +1,84 @@
+import random
+from src.ga.fitness import play_ipd
+from src.ga.strategies import (
+    AlwaysCooperate,
+    AlwaysDefect,
+    TitForTat,
+    get_bit_representations_for_strategies
+)
+from src.ga.tournament import deduplicate_strategies, run_tournament
+
+
+def test_run_tournament():
+    memory_size = 2
+    rounds = 10
+    payoff_matrix = {
+        (0, 0): (3, 3),  # Both cooperate
+        (0, 1): (0, 5),  # Player cooperates, opponent defects
+        (1, 0): (5, 0),  # Player defects, opponent cooperates
+        (1, 1): (1, 1)   # Both defect
+    }
+
+    strategies = get_bit_representations_for_strategies(
+        [AlwaysCooperate, AlwaysDefect, TitForTat, TitForTat], memory_size
+    )
+    names, representations, aliases = deduplicate_strategies(
+        dict(zip(["AC", "AD", "TFT", "TFT copy"], strategies))
+    )
+
+    assert names == ["AC", "AD", "TFT"]
+    assert aliases == {"AC": [], "AD": [], "TFT": ["TFT copy"]}
+
+    scores = run_tournament(representations, memory_size, rounds, payoff_matrix)
+
+    for i, player in enumerate(representations):
+        for j, opponent in enumerate(representations):
+            if i == j:
+                assert scores["mean"][i][j] == 0
+                continue
+
+            player_score, _ = play_ipd(player, opponent, memory_size, rounds, payoff_matrix)
+            assert scores["mean"][i][j] == player_score
+            assert scores["ci_lower"][i][j] == scores["ci_upper"][i][j] == player_score
+
+        assert scores["total_mean"][i] == sum(scores["mean"][i])
+
+
+def test_run_tournament_preserves_random_state():
+    memory_size = 1
+    payoff_matrix = {
+        (0, 0): (3, 3),  # Both cooperate
+        (0, 1): (0, 5),  # Player cooperates, opponent defects
+        (1, 0): (5, 0),  # Player defects, opponent cooperates
+        (1, 1): (1, 1)   # Both defect
+    }
+    strategies = get_bit_representations_for_strategies([AlwaysDefect, TitForTat], memory_size)
+
+    # Replicates played in-process do not reset the caller's random number stream
+    for noise_rate in [0.0, 0.1]:
+        random.seed(1)
+        state = random.getstate()
+        run_tournament(
+            strategies, memory_size, 10, payoff_matrix, noise_rate, replicates=2, processes=1,
+            seed=5
+        )
+        assert random.getstate() == state
+
+
+def test_run_tournament_self_play_totals():
+    memory_size = 1
+    payoff_matrix = {
+        (0, 0): (3, 3),  # Both cooperate
+        (0, 1): (0, 5),  # Player cooperates, opponent defects
+        (1, 0): (5, 0),  # Player defects, opponent cooperates
+        (1, 1): (1, 1)   # Both defect
+    }
+    strategies = get_bit_representations_for_strategies([AlwaysDefect, TitForTat], memory_size)
+
+    scores = run_tournament(strategies, memory_size, 10, payoff_matrix)
+    self_play_scores = run_tournament(strategies, memory_size, 10, payoff_matrix, self_play=True)
+
+    # Self-play scores are reported on the diagonal but left out of the totals
+    for i in range(len(strategies)):
+        assert self_play_scores["mean"][i][i] > 0
+        assert self_play_scores["total_mean"][i] == scores["total_mean"][i]
@@ -0,0 +1,78 @@
+import random
+from src.ga.crossover import single_point_crossover
+from src.ga.fitness import play_ipd
+from src.ga.genetic_algorithm import GeneticAlgorithm
+from src.ga.mutation import bit_flip_mutation
+from src.ga.strategies import generate_bit_representation, AlwaysDefect, TitForTat
+from src.ga.trace import TraceReader, TraceWriter, trace_ipd
+
+
+def test_trace_ipd(tmp_path):
+    memory_size = 2
+    rounds = 13
+    noise_rate = 0.2
+    payoff_matrix = {
+        (0, 0): (3, 3),  # Both cooperate
+        (0, 1): (0, 5),  # Player cooperates, opponent defects
+        (1, 0): (5, 0),  # Player defects, opponent cooperates
+        (1, 1): (1, 1)   # Both defect
+    }
+
+    player = generate_bit_representation(TitForTat(), memory_size)
+    opponent = generate_bit_representation(AlwaysDefect(), memory_size)
+
+    # Traced matches draw the same random numbers as untraced matches
+    random.seed(0)
+    trace = trace_ipd(player, opponent, memory_size, rounds, noise_rate)
+    random.seed(0)
+    assert trace.scores(payoff_matrix) == play_ipd(
+        player, opponent, memory_size, rounds, payoff_matrix, noise_rate
+    )
+
+    # Only noise can make AlwaysDefect cooperate
+    assert [1 - flip for flip in trace.opponent_flips] == trace.opponent_moves
+
+    path = str(tmp_path / "traces.bin")
+    with TraceWriter(path) as writer:
+        writer.write(trace, 3, 1, 0)
+        writer.write(trace_ipd(player, player, memory_size, 5), 3, 2, 0)
+
+    with TraceReader(path) as reader:
+        assert len(reader) == 2
+        assert reader.keys() == [(3, 1, 0), (3, 2, 0)]
+
+        read_trace = reader.read(3, 1, 0)[0]
+        assert read_trace.player_moves == trace.player_moves
+        assert read_trace.opponent_flips == trace.opponent_flips
+        assert read_trace.running_scores(payoff_matrix) == trace.running_scores(payoff_matrix)
+
+        assert reader.read(3, 2, 0)[0].scores(payoff_matrix) == (15, 15)
+        assert reader.read(3, 2, 0)[0].running_scores(payoff_matrix)[0] == [3, 6, 9, 12, 15]
+
+
+def test_genetic_algorithm_trace(tmp_path):
+    path = str(tmp_path / "traces.bin")
+    payoff_matrix = {
+        (0, 0): (3, 3),  # Both cooperate
+        (0, 1): (0, 5),  # Player cooperates, opponent defects
+        (1, 0): (5, 0),  # Player defects, opponent cooperates
+        (1, 1): (1, 1)   # Both defect
+    }
+    args = (
+        10, 0.8, single_point_crossover, 0.05, bit_flip_mutation, 3, 10, 0.2, 3,
+        [TitForTat, AlwaysDefect], 2, 10, payoff_matrix, 0.1, True
+    )
+
+    # Running again replaces the traces of the previous run
+    for _ in range(2):
+        random.seed(0)
+        ga = GeneticAlgorithm(*args, trace_path=path)
+        ga.evolve()
+
+        # The trace file is closed once the full budget has been run
+        assert ga.trace_writer is None
+
+        with TraceReader(path) as reader:
+            # Two elites per generation, each traced against the 9 other individuals
+            assert len(reader) == 3 * 2 * 9
+            assert sorted({generation for _, _, generation in reader.keys()}) == [0, 1, 2]